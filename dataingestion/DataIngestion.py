@@ -11,8 +11,17 @@ import logging
 import time
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
+from requests.adapters import HTTPAdapter
+from dataschema.ChurnSchema import CHURN_SCHEMA, parse_dtypes, apply_churn_schema, default_memory_usage
 import kagglehub
 import os
+import json
+import hashlib
+import threading
+import codecs
+import itertools
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 
 # ---------------------
@@ -38,35 +47,497 @@ file_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 logger.addHandler(file_handler)
 
+# ---------------------
+# HTTP response cache
+# ---------------------
+class HttpResponseCache:
+    """
+    On-disk cache of URL responses, revalidated with ETag / Last-Modified.
+    A 304 reply is served from the local copy; bodies are streamed to disk and parsed from
+    there, so nothing beyond the caller's result is held in memory. Parsed DataFrames are kept
+    as Feather files next to their bodies, so an unchanged response is not parsed again.
+    Total size on disk is bounded by `max_bytes` with LRU eviction.
+    """
+
+    def __init__(self, cache_dir="http_cache", max_bytes=500_000_000):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_file):
+            with open(self.index_file, "r") as f:
+                self.index = json.load(f)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    @staticmethod
+    def _stored_size(entry):
+        return entry["size"] + entry.get("frame_size", 0)
+
+    def _evict(self, keep=None):
+        total = sum(self._stored_size(entry) for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._stored_size(self.index[key])
+            body_path = self._body_path(key)
+            for path in (body_path, f"{body_path}.feather"):
+                if os.path.exists(path):
+                    os.remove(path)
+            del self.index[key]
+            logger.info(f"[HTTP cache] Evicted {key}")
+
+    def fetch(self, url, params=None, headers=None, timeout=30, session=None):
+        """Conditional GET. Returns (key, body_path, from_cache)."""
+        key = requests.Request("GET", url, params=params).prepare().url
+        request_headers = dict(headers or {})
+        with self._lock:
+            entry = self.index.get(key)
+        body_path = self._body_path(key)
+        if entry and os.path.exists(body_path):
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        else:
+            entry = None
+
+        with (session or requests).get(url, params=params, headers=request_headers, timeout=timeout,
+                                        stream=True) as response:
+            if response.status_code == 304 and entry is not None:
+                with self._lock:
+                    self.hits += 1
+                    entry["last_access"] = time.time()
+                    self._save_index()
+                logger.info(f"[HTTP cache] HIT (304) for {key}")
+                return key, body_path, True
+
+            response.raise_for_status()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            size = 0
+            # Same digest _read_csv_fingerprinted computes over the body file
+            hasher = hashlib.blake2b(digest_size=16)
+            try:
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        size += len(chunk)
+                # The frame parsed from the previous body must not outlive it
+                if os.path.exists(f"{body_path}.feather"):
+                    os.remove(f"{body_path}.feather")
+                os.replace(tmp_path, body_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        with self._lock:
+            self.misses += 1
+            self.index[key] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": size,
+                "fingerprint": hasher.hexdigest(),
+                "last_access": time.time(),
+            }
+            self._evict(keep=key)
+            self._save_index()
+        logger.info(f"[HTTP cache] MISS for {key} ({size} bytes stored)")
+        return key, body_path, False
+
+    def load(self, url, parser, params=None, headers=None, timeout=30, session=None):
+        """
+        Fetch `url` through the cache and return `parser(body_path)`; a 304 skips the download.
+        A DataFrame result is stored as Feather next to the body, and a later 304 reads that
+        back instead of calling the parser; it carries the body's attrs["fingerprint"], so
+        mark_fingerprint still sees an unchanged source.
+        """
+        key, body_path, from_cache = self.fetch(url, params=params, headers=headers, timeout=timeout, session=session)
+        frame_path = f"{body_path}.feather"
+        with self._lock:
+            entry = dict(self.index.get(key, {}))
+        if from_cache and "frame_size" in entry and os.path.exists(frame_path):
+            df = pd.read_feather(frame_path)
+            df.attrs["fingerprint"] = entry.get("fingerprint")
+            logger.info(f"[HTTP cache] Parsed frame reused for {key}")
+            return df
+        result = parser(body_path)
+        if isinstance(result, pd.DataFrame):
+            tmp_path = f"{frame_path}.{threading.get_ident()}.tmp"
+            try:
+                result.to_feather(tmp_path)
+                os.replace(tmp_path, frame_path)
+            except Exception as e:
+                # The frame is only a shortcut; the body is still cached
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                logger.warning(f"[HTTP cache] Could not store the parsed frame for {key}: {e}")
+                return result
+            with self._lock:
+                if key in self.index:
+                    self.index[key]["frame_size"] = os.path.getsize(frame_path)
+                    self._evict(keep=key)
+                    self._save_index()
+        return result
+
+    def log_stats(self, reset=True):
+        """Log hit/miss counts (per cycle when reset after each cycle)."""
+        with self._lock:
+            if self.hits or self.misses:
+                logger.info(f"[HTTP cache] {self.hits} hits, {self.misses} misses")
+            if reset:
+                self.hits = 0
+                self.misses = 0
+
+http_cache = HttpResponseCache()
+
+def _read_json_file(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+# ---------------------
+# Source fingerprints
+# ---------------------
+fingerprint_file = os.path.join(os.path.dirname(os.path.abspath(log_file)), "ingestion_fingerprints.json")
+_fingerprint_lock = threading.Lock()
+
+class _HashingReader:
+    """File-like wrapper that feeds every byte the parser reads into a blake2b digest."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.hasher = hashlib.blake2b(digest_size=16)
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.hasher.update(data)
+        return data
+
+    def hexdigest(self):
+        # Drain anything the parser did not consume so the digest covers the full body
+        while self.read(1 << 20):
+            pass
+        return self.hasher.hexdigest()
+
+def _read_csv_fingerprinted(path_or_url: str, **read_kwargs) -> pd.DataFrame:
+    """Parse a CSV while hashing its raw bytes in the same pass; digest goes to df.attrs["fingerprint"]."""
+    if path_or_url.startswith(("http://", "https://")):
+        with requests.get(path_or_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            reader = _HashingReader(response.raw)
+            df = pd.read_csv(reader, **read_kwargs)
+            digest = reader.hexdigest()
+    elif "://" in path_or_url:
+        # Other fsspec-style URLs: fingerprint the parsed values instead of the bytes
+        df = pd.read_csv(path_or_url, **read_kwargs)
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).values.tobytes(), digest_size=16).hexdigest()
+    else:
+        with open(path_or_url, "rb") as f:
+            reader = _HashingReader(f)
+            df = pd.read_csv(reader, **read_kwargs)
+            digest = reader.hexdigest()
+    df.attrs["fingerprint"] = digest
+    return df
+
+def _load_fingerprints():
+    if os.path.exists(fingerprint_file):
+        with open(fingerprint_file, "r") as f:
+            return json.load(f)
+    return {}
+
+def mark_fingerprint(df: pd.DataFrame, source: str, path_or_url: str) -> pd.DataFrame:
+    """
+    Compare df.attrs["fingerprint"] with the last one committed for this source and set
+    df.attrs["unchanged"], so callers can skip downstream stages for byte-identical input.
+    Nothing is persisted here: call commit_fingerprint(df) once the downstream stages have
+    succeeded, so a failed run is retried in full on the next cycle.
+    """
+    fingerprint = df.attrs.get("fingerprint")
+    if fingerprint is None:
+        df.attrs["unchanged"] = False
+        return df
+    key = f"{source}|{path_or_url}"
+    with _fingerprint_lock:
+        previous = _load_fingerprints().get(key, {}).get("fingerprint")
+    df.attrs["fingerprint_key"] = key
+    df.attrs["unchanged"] = previous == fingerprint
+    if df.attrs["unchanged"]:
+        logger.info(f"[{source}] Source unchanged since last cycle (fingerprint {fingerprint})")
+    return df
+
+def commit_fingerprint(df: pd.DataFrame) -> bool:
+    """Record df's fingerprint as processed; call after validation/storage succeeded. Returns False if there is none."""
+    fingerprint, key = df.attrs.get("fingerprint"), df.attrs.get("fingerprint_key")
+    if fingerprint is None or key is None:
+        return False
+    with _fingerprint_lock:
+        fingerprints = _load_fingerprints()
+        fingerprints[key] = {"fingerprint": fingerprint, "updated_at": datetime.now().isoformat()}
+        tmp_file = f"{fingerprint_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(fingerprints, f, indent=2)
+        os.replace(tmp_file, fingerprint_file)
+    logger.info(f"[{key.split('|', 1)[0]}] Fingerprint {fingerprint} committed")
+    return True
+
 # ---------------------
 # Ingestion functions
 # ---------------------
-def load_csv(path_or_url: str, source: str) -> pd.DataFrame:
+def load_csv(path_or_url: str, source: str, cache: HttpResponseCache = None, schema=CHURN_SCHEMA) -> pd.DataFrame:
     try:
         logger.info(f"[{source}] CSV data loading from {path_or_url}")
-        df = pd.read_csv(path_or_url)
+        parser = partial(_read_csv_fingerprinted, dtype=parse_dtypes(schema) if schema else None)
+        if cache is not None and path_or_url.startswith(("http://", "https://")):
+            df = cache.load(path_or_url, parser)
+        else:
+            df = parser(path_or_url)
+        if schema:
+            before = default_memory_usage(df)
+            apply_churn_schema(df, schema, log=False)
+            after = int(df.memory_usage(deep=True).sum())
+            logger.info(f"[{source}] Compact schema applied: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB")
+        mark_fingerprint(df, source, path_or_url)
         logger.info(f"[{source}] CSV data loaded with shape {df.shape}")
         return df
     except Exception as e:
         logger.error(f"[{source}] CSV ingestion failed: {e}")
         return pd.DataFrame()
 
-def load_api(endpoint: str, params=None, headers=None):
+def load_csv_chunks(path_or_url: str, source: str, chunksize: int = 100_000, usecols=None, dtype=None):
+    """
+    Stream a CSV as typed DataFrame chunks of `chunksize` rows.
+    Only one chunk is held in memory at a time; `usecols`/`dtype` are applied by the parser.
+    Errors are logged and re-raised: a stream that stops early must not look complete.
+    """
+    rows = 0
+    chunk_no = 0
+    try:
+        logger.info(f"[{source}] CSV streaming from {path_or_url} (chunksize={chunksize})")
+        reader = pd.read_csv(path_or_url, chunksize=chunksize, usecols=usecols, dtype=dtype)
+        with reader:
+            for chunk in reader:
+                chunk_no += 1
+                rows += len(chunk)
+                logger.info(f"[{source}] CSV chunk {chunk_no} loaded with shape {chunk.shape} ({rows} rows so far)")
+                yield chunk
+        logger.info(f"[{source}] CSV streaming completed: {chunk_no} chunks, {rows} rows")
+    except Exception as e:
+        logger.error(f"[{source}] CSV streaming failed after {chunk_no} chunks: {e}")
+        raise
+
+def load_api(endpoint: str, params=None, headers=None, cache: HttpResponseCache = None):
     try:
         logger.info(f"[API] Fetching data from {endpoint}")
-        response = requests.get(endpoint, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        if cache is not None:
+            data = cache.load(endpoint, _read_json_file, params=params, headers=headers, timeout=10)
+        else:
+            response = requests.get(endpoint, params=params, headers=headers, timeout=10)
+            response.raise_for_status()
+            data = response.json()
         logger.info(f"[API] Data fetched with {len(data)} records")
         return data
     except Exception as e:
         logger.error(f"[API] Ingestion failed: {e}")
         return []
 
+# ---------------------
+# Paginated API ingestion
+# ---------------------
+_api_session = None
+_api_session_lock = threading.Lock()
+
+def get_api_session(pool_maxsize=16):
+    """Shared keep-alive session so paginated requests reuse pooled TCP/TLS connections."""
+    global _api_session
+    with _api_session_lock:
+        if _api_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _api_session = session
+        return _api_session
+
+def _iter_text(response, read_size=65536):
+    """Decoded text chunks of a streamed response body."""
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    for chunk in response.iter_content(chunk_size=read_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def _iter_ndjson(chunks):
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        yield json.loads(buffer)
+
+def _iter_json_array(chunks):
+    """Decode the elements of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array body")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            if end == len(buffer) or buffer[end] not in ",] \t\r\n":
+                break  # a number cut at "1." or "1e" may continue in the next chunk; "]" always follows
+            yield record
+            pos = end
+        buffer = buffer[pos:]
+    # Reaching the end of the body without "]" means it was truncated or malformed
+    detail = f" near {buffer[:80]!r}" if buffer.strip() else ""
+    raise ValueError(f"JSON array body ended before its closing ']'{detail}")
+
+def _iter_page_records(response, page_info, records_field):
+    """Yield the records of one page; envelope metadata (e.g. next cursor) is stored in `page_info`."""
+    chunks = _iter_text(response)
+    content_type = response.headers.get("Content-Type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        yield from _iter_ndjson(chunks)
+        return
+    head = ""
+    for chunk in chunks:
+        head += chunk
+        if head.strip():
+            break
+    body = itertools.chain([head], chunks)
+    first = head.lstrip()[:1]
+    if first == "[":
+        yield from _iter_json_array(body)
+    elif first == "{":
+        # Object envelope: a page is bounded by page_size, so decode it whole
+        payload = json.loads("".join(body))
+        page_info.update({k: v for k, v in payload.items() if k != records_field})
+        yield from payload.get(records_field) or []
+    elif first:
+        # Anything else is treated as NDJSON served without a specific content type
+        yield from _iter_ndjson(body)
+
+def load_api_pages(endpoint: str, pagination: str = "cursor", params=None, headers=None,
+                   page_size=1000, batch_size=10_000, records_field="data",
+                   cursor_param="cursor", cursor_field="next_cursor", cursor_header="X-Next-Cursor",
+                   offset_param="offset", limit_param="limit", max_pages=None, timeout=30, session=None):
+    """
+    Stream a paginated API as lists of up to `batch_size` records.
+    pagination: "cursor" (next cursor from the `cursor_field` envelope key or `cursor_header`),
+                "offset" (offset/limit until a short page), or "link" (RFC 5988 `Link: rel="next"`).
+    Bodies may be NDJSON, a JSON array, or an object envelope holding `records_field`; arrays and
+    NDJSON are decoded incrementally. All pages go through one pooled keep-alive session.
+    A failed page or a truncated body is logged and re-raised rather than ending the stream.
+    """
+    if pagination not in ("cursor", "offset", "link"):
+        raise ValueError(f"Unknown pagination style: {pagination}")
+    session = session or get_api_session()
+    params = dict(params or {})
+    url = endpoint
+    offset = params.get(offset_param, 0)
+    pages = 0
+    total = 0
+    batch = []
+    try:
+        logger.info(f"[API] Paginated fetch ({pagination}) from {endpoint}")
+        while url:
+            page_params = dict(params)
+            if pagination == "offset":
+                page_params.update({offset_param: offset, limit_param: page_size})
+            elif pagination == "cursor":
+                page_params.setdefault(limit_param, page_size)
+            with session.get(url, params=page_params if pagination != "link" or pages == 0 else None,
+                             headers=headers, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                page_info = {}
+                page_records = 0
+                for record in _iter_page_records(response, page_info, records_field):
+                    batch.append(record)
+                    page_records += 1
+                    if len(batch) >= batch_size:
+                        total += len(batch)
+                        yield batch
+                        batch = []
+                next_link = response.links.get("next", {}).get("url")
+                next_cursor = page_info.get(cursor_field) or response.headers.get(cursor_header)
+
+            pages += 1
+            logger.info(f"[API] Page {pages} fetched with {page_records} records")
+            if max_pages is not None and pages >= max_pages:
+                break
+            if pagination == "offset":
+                offset += page_records
+                url = url if page_records >= page_size else None
+            elif pagination == "cursor":
+                params[cursor_param] = next_cursor
+                url = url if next_cursor and page_records else None
+            else:
+                url = next_link
+        if batch:
+            total += len(batch)
+            yield batch
+        logger.info(f"[API] Paginated fetch completed: {pages} pages, {total} records")
+    except Exception as e:
+        logger.error(f"[API] Paginated ingestion failed after {pages} pages: {e}")
+        raise
+
+# ---------------------
+# Database ingestion
+# ---------------------
+_engines = {}
+_engines_lock = threading.Lock()
+watermark_file = "db_watermarks.json"
+
+def get_engine(connection_string: str):
+    """One pooled engine per connection string, created on first use."""
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            engine = sqlalchemy.create_engine(connection_string, pool_pre_ping=True)
+            _engines[connection_string] = engine
+        return engine
+
 def load_db(query: str, connection_string: str) -> pd.DataFrame:
     try:
         logger.info(f"[DB] Executing query on {connection_string}")
-        engine = sqlalchemy.create_engine(connection_string)
+        engine = get_engine(connection_string)
         df = pd.read_sql(query, engine)
         logger.info(f"[DB] Data loaded with shape {df.shape}")
         return df
@@ -74,13 +545,141 @@ def load_db(query: str, connection_string: str) -> pd.DataFrame:
         logger.error(f"[DB] Ingestion failed: {e}")
         return pd.DataFrame()
 
+def load_db_chunks(query, connection_string: str, chunksize: int = 50_000, params=None):
+    """
+    Stream a query result as DataFrame chunks through a server-side cursor.
+    Errors are logged and re-raised so callers never mistake a broken stream for a complete one.
+    """
+    rows = 0
+    chunk_no = 0
+    try:
+        logger.info(f"[DB] Streaming query on {connection_string} (chunksize={chunksize})")
+        engine = get_engine(connection_string)
+        with engine.connect().execution_options(stream_results=True) as conn:
+            for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+                chunk_no += 1
+                rows += len(chunk)
+                logger.info(f"[DB] Chunk {chunk_no} loaded with shape {chunk.shape} ({rows} rows so far)")
+                yield chunk
+        logger.info(f"[DB] Streaming completed: {chunk_no} chunks, {rows} rows")
+    except Exception as e:
+        logger.error(f"[DB] Streaming ingestion failed after {chunk_no} chunks: {e}")
+        raise
+
+def _watermark_key(connection_string, table, column):
+    # Hash the connection string so credentials never land in the state file
+    digest = hashlib.sha256(connection_string.encode("utf-8")).hexdigest()[:16]
+    return f"{digest}:{table}.{column}"
+
+def _load_watermarks(state_file):
+    if os.path.exists(state_file):
+        with open(state_file, "r") as f:
+            return json.load(f)
+    return {}
+
+def _encode_mark(value):
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return {"type": "datetime", "value": pd.Timestamp(value).isoformat()}
+    value = value.item() if hasattr(value, "item") else value
+    return {"type": type(value).__name__, "value": value}
+
+def _decode_mark(entry):
+    if entry["type"] == "datetime":
+        return pd.Timestamp(entry["value"]).to_pydatetime()
+    return entry["value"]
+
+def get_watermark(table: str, column: str, connection_string: str, state_file: str = watermark_file,
+                  key_column: str = None):
+    """
+    Last high-water mark stored for `table.column`, or None before the first incremental run.
+    With `key_column` the mark is the (column, key) pair of the last row read, returned as a tuple.
+    """
+    name = f"{column}|{key_column}" if key_column else column
+    entry = _load_watermarks(state_file).get(_watermark_key(connection_string, table, name))
+    if entry is None:
+        return None
+    if key_column:
+        return _decode_mark(entry["mark"]), _decode_mark(entry["key"])
+    return _decode_mark(entry)
+
+def set_watermark(table: str, column: str, connection_string: str, value, state_file: str = watermark_file,
+                  key_column: str = None):
+    """Store the mark; with `key_column`, `value` is the (column, key) pair of the last row read."""
+    if key_column:
+        entry = {"mark": _encode_mark(value[0]), "key": _encode_mark(value[1])}
+        name = f"{column}|{key_column}"
+    else:
+        entry = _encode_mark(value)
+        name = column
+    watermarks = _load_watermarks(state_file)
+    watermarks[_watermark_key(connection_string, table, name)] = entry
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+def load_db_incremental(table: str, watermark_column: str, connection_string: str, columns=None,
+                        chunksize: int = 50_000, state_file: str = watermark_file, key_column: str = None):
+    """
+    Stream only rows whose `watermark_column` (a monotonically increasing key or updated_at
+    timestamp) is above the stored high-water mark. The mark advances only after the stream
+    has been fully consumed without error, so an interrupted run re-reads the same slice.
+    When `watermark_column` can have ties (e.g. timestamps), pass a unique `key_column`: rows
+    are then read in (watermark, key) order and the mark is that compound pair, so rows that
+    share the last timestamp are neither skipped nor read twice.
+    """
+    engine = get_engine(connection_string)
+    quote = engine.dialect.identifier_preparer.quote
+    if columns and key_column and key_column not in columns:
+        columns = list(columns) + [key_column]
+    col_list = ", ".join(quote(c) for c in columns) if columns else "*"
+    watermark = get_watermark(table, watermark_column, connection_string, state_file, key_column)
+    mark_col = quote(watermark_column)
+    query = f"SELECT {col_list} FROM {quote(table)}"
+    params = {}
+    if watermark is not None and key_column:
+        query += f" WHERE {mark_col} > :watermark OR ({mark_col} = :watermark AND {quote(key_column)} > :watermark_key)"
+        params["watermark"], params["watermark_key"] = watermark
+    elif watermark is not None:
+        query += f" WHERE {mark_col} > :watermark"
+        params["watermark"] = watermark
+    query += f" ORDER BY {mark_col}" + (f", {quote(key_column)}" if key_column else "")
+    logger.info(f"[DB] Incremental read of {table} where {watermark_column} > {watermark}")
+
+    new_mark = None
+    rows = 0
+    for chunk in load_db_chunks(sqlalchemy.text(query), connection_string, chunksize, params):
+        if len(chunk):
+            if key_column:
+                last = chunk.iloc[-1]
+                new_mark = (last[watermark_column], last[key_column])
+            else:
+                chunk_max = chunk[watermark_column].max()
+                new_mark = chunk_max if new_mark is None else max(new_mark, chunk_max)
+            rows += len(chunk)
+        yield chunk
+
+    if new_mark is not None:
+        set_watermark(table, watermark_column, connection_string, new_mark, state_file, key_column)
+        logger.info(f"[DB] {rows} new rows from {table}; watermark advanced to {new_mark}")
+    else:
+        logger.info(f"[DB] No new rows in {table} since {watermark}")
+
 # ---------------------
 # Retry wrapper
 # ---------------------
-def safe_ingest(func, retries=3, delay=5, *args, **kwargs):
-    """Retry ingestion function if it fails, with backoff delay."""
+def safe_ingest(func, retries=3, delay=5, *args, deadline=None, **kwargs):
+    """
+    Retry ingestion function if it fails, with backoff delay.
+    deadline: absolute time.perf_counter() value; no attempt is started and no backoff sleep
+    is taken once it has passed (or would pass during the sleep), so an abandoned source stops.
+    """
+    empty = pd.DataFrame() if func.__name__ != "load_api" else []
     attempt = 0
     while attempt < retries:
+        if deadline is not None and time.perf_counter() >= deadline:
+            logger.error(f"Deadline passed for {func.__name__}; giving up after {attempt} attempts")
+            return empty
         result = func(*args, **kwargs)
         if isinstance(result, pd.DataFrame) and not result.empty:
             return result
@@ -88,34 +687,116 @@ def safe_ingest(func, retries=3, delay=5, *args, **kwargs):
             return result
 
         attempt += 1
+        if attempt >= retries:
+            break
+        if deadline is not None and time.perf_counter() + delay >= deadline:
+            logger.error(f"No time left before the deadline to retry {func.__name__}")
+            return empty
         logger.warning(f"Retry {attempt}/{retries} after failure. Waiting {delay} sec...")
         time.sleep(delay)
     logger.error(f"All {retries} attempts failed for {func.__name__}")
-    return pd.DataFrame() if func.__name__ != "load_api" else []
+    return empty
+
+# ---------------------
+# Source registry
+# ---------------------
+MICROSOFT_CHURN_URL = "https://synapseaisolutionsa.z13.web.core.windows.net/data/bankcustomerchurn/churn.csv"
+
+def default_ingestion_sources():
+    """Sources fetched on every periodic cycle: name -> func/args/kwargs/retries/delay/timeout."""
+    return {
+        "Microsoft": {
+            "func": load_csv,
+            "args": (MICROSOFT_CHURN_URL, "CSV_Source"),
+            "kwargs": {"cache": http_cache},
+            "retries": 3,
+            "delay": 5,
+            "timeout": 120,
+        },
+        "Kaggle": {
+            "func": load_csv,
+            "args": (os.path.join(os.getcwd(), "Customer_Churn_kaggle.csv"), "CSV_Source"),
+            "retries": 3,
+            "delay": 5,
+            "timeout": 60,
+        },
+    }
+
+def run_ingestion_cycle(sources=None, max_workers=None):
+    """
+    Fetch all registered sources concurrently on a thread pool.
+    Each source gets its own deadline (`timeout` seconds from the start of the cycle), so the
+    cycle takes about as long as the slowest source. A source that misses its deadline is
+    reported as empty; the deadline is also passed to safe_ingest, so its worker stops
+    retrying instead of sleeping on in the background.
+    Returns (results, latencies) keyed by source name.
+    """
+    sources = sources if sources is not None else default_ingestion_sources()
+    results, latencies = {}, {}
+    if not sources:
+        return results, latencies
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(sources), thread_name_prefix="ingest")
+    cycle_start = time.perf_counter()
+    started, finished, futures = {}, {}, {}
+    for name, spec in sources.items():
+        started[name] = time.perf_counter()
+        timeout = spec.get("timeout")
+        futures[name] = executor.submit(
+            safe_ingest, spec["func"], spec.get("retries", 3), spec.get("delay", 5),
+            *spec.get("args", ()), deadline=None if timeout is None else cycle_start + timeout,
+            **spec.get("kwargs", {})
+        )
+        futures[name].add_done_callback(lambda f, n=name: finished.setdefault(n, time.perf_counter()))
+
+    # Collect in deadline order so an early deadline is enforced even while a slower source is pending
+    by_deadline = sorted(futures, key=lambda n: sources[n].get("timeout") or float("inf"))
+    try:
+        for name in by_deadline:
+            future = futures[name]
+            func = sources[name]["func"]
+            timeout = sources[name].get("timeout")
+            remaining = None if timeout is None else max(0.0, timeout - (time.perf_counter() - cycle_start))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.error(f"[{name}] Source missed its {timeout}s deadline")
+                results[name] = [] if func.__name__ == "load_api" else pd.DataFrame()
+            except Exception as e:
+                logger.error(f"[{name}] Source failed: {e}")
+                results[name] = [] if func.__name__ == "load_api" else pd.DataFrame()
+            latencies[name] = finished.get(name, time.perf_counter()) - started[name]
+            logger.info(f"[{name}] Source finished in {latencies[name]:.2f} sec")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Cycle fetched {len(sources)} sources in {time.perf_counter() - cycle_start:.2f} sec")
+    http_cache.log_stats()
+    results = {name: results[name] for name in sources}
+    latencies = {name: latencies[name] for name in sources}
+    return results, latencies
 
 # ---------------------
 # Scheduler
 # ---------------------
-def run_periodic_ingestion(interval_seconds=60):
-    """Run ingestion periodically at fixed interval."""
+def run_periodic_ingestion(interval_seconds=60, sources=None):
+    """
+    Run ingestion periodically at fixed interval.
+    Returned frames carry attrs["unchanged"]; call commit_fingerprint(df) after the downstream
+    stages have processed a changed frame.
+    """
     while True:
         logger.info(f"=== Ingestion cycle started at {datetime.now()} ===")
 
-        # Example sources (replace with real)
-        logger.info(f"=== Loading from Microsoft data set ===")
-        df_csv = safe_ingest(load_csv, 3, 5, "https://synapseaisolutionsa.z13.web.core.windows.net/data/bankcustomerchurn/churn.csv", "CSV_Source")
-        
-
-
-    # Download latest version
-        current_directory = os.getcwd()
-        path = current_directory+ "/Customer_Churn_kaggle.csv"
+        results, latencies = run_ingestion_cycle(sources)
+        df_csv = results.get("Microsoft", pd.DataFrame())
 
-        logger.info("Kaggle dataset for customer churn")
-        safe_ingest(load_csv, 3, 5, path, "CSV_Source")
         # For monitoring, log sizes
-        logger.info(f"CSV shape: {df_csv.shape if isinstance(df_csv, pd.DataFrame) else 'N/A'}")
-       
+        for name, result in results.items():
+            shape = result.shape if isinstance(result, pd.DataFrame) else len(result)
+            unchanged = result.attrs.get("unchanged", False) if isinstance(result, pd.DataFrame) else False
+            logger.info(f"[{name}] shape: {shape}, latency: {latencies[name]:.2f} sec, unchanged: {unchanged}")
 
         logger.info("=== Ingestion cycle completed ===\n")
         time.sleep(interval_seconds)  # wait before next cycle
@@ -6,105 +6,442 @@
 
 import logging
 import os
+import time
+import json
+import resource
+import tracemalloc
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_pdf import PdfPages
+from reporting.ReportQueue import run_report
+from dataschema.StreamingStats import KLLSketch
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-def preprocess_and_eda(df: pd.DataFrame, output_dir="preprocessing_reports"):
+# ---------------------
+# Fitted preprocessing artifact
+# ---------------------
+CATEGORICAL_INT_COLS = ["NumOfProducts", "HasCrCard", "IsActiveMember", "Exited"]
+ID_COLS = ["RowNumber", "CustomerId", "Surname"]  # identifiers to exclude from scaling
+
+class ChurnPreprocessor:
+    """
+    Fitted imputation, label encoding and standard scaling for the churn data.
+    fit() learns fill values, one sorted class array per string column (the LabelEncoder
+    ordering) and the scaler mean/scale arrays; transform() applies them to any batch with
+    vectorized column operations and no refitting.
+    """
+
+    def __init__(self):
+        self.continuous_cols = []
+        self.categorical_int_cols = []
+        self.categorical_str_cols = []
+        self.fill_values = {}
+        self.classes = {}
+        self.mean = np.empty(0)
+        self.scale = np.empty(0)
+
+    def fit(self, df: pd.DataFrame):
+        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        self.categorical_int_cols = [c for c in CATEGORICAL_INT_COLS if c in df.columns]
+        self.continuous_cols = [c for c in numeric_cols if c not in CATEGORICAL_INT_COLS + ID_COLS]
+        self.categorical_str_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+
+        self.fill_values = {}
+        for col in self.continuous_cols:
+            self.fill_values[col] = df[col].median()
+        for col in self.categorical_int_cols + self.categorical_str_cols:
+            self.fill_values[col] = df[col].mode()[0]
+        self.fill_values = {c: v.item() if hasattr(v, "item") else v for c, v in self.fill_values.items()}
+
+        # Sorted observed values per string column: the same classes LabelEncoder would learn,
+        # without materializing the column as an object array
+        self.classes = {}
+        for col in self.categorical_str_cols:
+            observed = pd.Series(df[col].unique()).dropna()
+            self.classes[col] = np.unique(np.asarray(observed, dtype=object))
+
+        # StandardScaler moments one column at a time (no 2D float64 copy of the frame)
+        means, scales = [], []
+        for col in self.continuous_cols:
+            values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+            values = np.where(np.isnan(values), self.fill_values[col], values)
+            means.append(values.mean())
+            scales.append(values.std())
+        self.mean, self.scale = np.array(means), np.array(scales)
+        self.scale[self.scale < 10 * np.finfo("float64").eps] = 1.0
+        return self
+
+    def transform(self, df: pd.DataFrame, copy=True, compact=False) -> pd.DataFrame:
+        """
+        Apply the fitted parameters; unseen categories are encoded as -1.
+        copy=False skips the up-front deep copy: under copy-on-write only the columns that are
+        rewritten get new buffers and the caller's frame is left unchanged.
+        compact=True writes scaled columns as float32 (they are z-scores, so float32's ~7
+        significant digits are ample) and codes with the narrowest signed int that fits.
+        """
+        df = df.copy() if copy else df.copy(deep=False)
+        for col, value in self.fill_values.items():
+            if col in df.columns and df[col].hasnans:
+                df[col] = df[col].fillna(value)
+        for col in self.categorical_str_cols:
+            classes = pd.Index(self.classes[col])
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                lookup = classes.get_indexer(df[col].cat.categories)
+                codes = np.where(df[col].cat.codes.to_numpy() >= 0, lookup[df[col].cat.codes.to_numpy()], -1)
+            else:
+                codes = classes.get_indexer(np.asarray(df[col], dtype=object))
+            code_dtype = np.result_type(np.min_scalar_type(-len(classes)), np.int8) if compact else "int64"
+            df[col] = codes.astype(code_dtype)
+        scaled_dtype = "float32" if compact else "float64"
+        for col, mean, scale in zip(self.continuous_cols, self.mean, self.scale):
+            values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+            df[col] = ((values - mean) / scale).astype(scaled_dtype, copy=False)
+        return df
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def save(self, path: str):
+        meta = {
+            "continuous_cols": self.continuous_cols,
+            "categorical_int_cols": self.categorical_int_cols,
+            "categorical_str_cols": self.categorical_str_cols,
+            "fill_values": self.fill_values,
+        }
+        arrays = {f"classes/{c}": np.asarray(v).astype(str) for c, v in self.classes.items()}
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), mean=self.mean, scale=self.scale, **arrays)
+        logging.info(f"Preprocessing artifact saved at {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str):
+        pre = cls()
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            pre.continuous_cols = meta["continuous_cols"]
+            pre.categorical_int_cols = meta["categorical_int_cols"]
+            pre.categorical_str_cols = meta["categorical_str_cols"]
+            pre.fill_values = meta["fill_values"]
+            pre.mean, pre.scale = data["mean"], data["scale"]
+            pre.classes = {c: data[f"classes/{c}"] for c in pre.categorical_str_cols}
+        return pre
+
+def transform_only(df: pd.DataFrame, artifact_path: str) -> pd.DataFrame:
+    """Fast scoring/incremental path: load a saved ChurnPreprocessor and transform, no refit and no EDA."""
+    return ChurnPreprocessor.load(artifact_path).transform(df)
+
+# ---------------------
+# Out-of-core (chunked) preprocessing
+# ---------------------
+class BoundedCounter:
+    """
+    Misra-Gries heavy-hitter counter holding at most `capacity` values. mode() is exact only
+    while the column has at most `capacity` distinct values (ties are broken on the smallest
+    value like Series.mode()). Past that, counts are cut: each is low by at most n / (capacity + 1),
+    every value occurring in more rows than that is kept, and mode() is approximate - it returns
+    a value whose true count is within n / (capacity + 1) of the true mode's.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.counts = {}
+
+    def update(self, series: pd.Series):
+        chunk_counts = series.value_counts(dropna=True)
+        for value, count in chunk_counts[chunk_counts > 0].items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        if len(self.counts) > self.capacity:
+            cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {v: c - cut for v, c in self.counts.items() if c > cut}
+
+    def mode(self):
+        if not self.counts:
+            return np.nan
+        top = max(self.counts.values())
+        return min(v for v, c in self.counts.items() if c == top)
+
+def fit_preprocessor_chunked(chunks, sketch_k=1024, mode_capacity=1024) -> ChurnPreprocessor:
+    """
+    Single streaming pass that fits a ChurnPreprocessor without holding the dataset:
+    medians come from a KLL sketch per continuous column, modes from bounded counters,
+    category classes from the union of values seen, and mean/variance from
+    StandardScaler.partial_fit (NaNs ignored, then corrected for the imputed medians).
+    """
+    pre = ChurnPreprocessor()
+    sketches, counters, classes, missing = {}, {}, {}, {}
+    scaler = StandardScaler()
+    rows = 0
+    for chunk in chunks:
+        if rows == 0:
+            numeric_cols = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            pre.categorical_int_cols = [c for c in CATEGORICAL_INT_COLS if c in chunk.columns]
+            pre.continuous_cols = [c for c in numeric_cols if c not in CATEGORICAL_INT_COLS + ID_COLS]
+            pre.categorical_str_cols = chunk.select_dtypes(include=["object", "category"]).columns.tolist()
+            sketches = {c: KLLSketch(k=sketch_k) for c in pre.continuous_cols}
+            counters = {c: BoundedCounter(mode_capacity) for c in pre.categorical_int_cols + pre.categorical_str_cols}
+            classes = {c: set() for c in pre.categorical_str_cols}
+            missing = np.zeros(len(pre.continuous_cols))
+        rows += len(chunk)
+        for col, sketch in sketches.items():
+            sketch.update(chunk[col].to_numpy(dtype="float64", na_value=np.nan))
+        for col, counter in counters.items():
+            counter.update(chunk[col])
+        for col, seen in classes.items():
+            seen.update(chunk[col].dropna().unique())
+        if pre.continuous_cols:
+            values = chunk[pre.continuous_cols].to_numpy(dtype="float64", na_value=np.nan)
+            missing += np.isnan(values).sum(axis=0)
+            scaler.partial_fit(values)
+
+    pre.fill_values = {c: sketches[c].quantile(0.5) for c in pre.continuous_cols}
+    pre.fill_values.update({c: counter.mode() for c, counter in counters.items()})
+    pre.fill_values = {c: v.item() if hasattr(v, "item") else v for c, v in pre.fill_values.items()}
+    pre.classes = {col: np.unique(np.asarray(list(seen), dtype=object)) for col, seen in classes.items()}
+
+    if pre.continuous_cols:
+        # Fold the imputed medians into the moments (Chan's merge with a zero-variance group)
+        medians = np.array([pre.fill_values[c] for c in pre.continuous_cols])
+        seen_n = np.broadcast_to(scaler.n_samples_seen_, medians.shape).astype("float64")
+        total = seen_n + missing
+        delta = medians - scaler.mean_
+        pre.mean = scaler.mean_ + delta * missing / total
+        var = (scaler.var_ * seen_n + delta ** 2 * seen_n * missing / total) / total
+        scale = np.sqrt(var)
+        pre.scale = np.where(scale < 10 * np.finfo(scale.dtype).eps, 1.0, scale)
+    logging.info(f"Chunked preprocessing fit on {rows} rows")
+    return pre
+
+def preprocess_chunked(make_chunks, output_dir: str, sketch_k=1024, mode_capacity=1024, preprocessor=None) -> str:
+    """
+    Out-of-core preprocessing. `make_chunks` is a callable returning a fresh chunk iterator
+    (e.g. lambda: load_csv_chunks(path, "CSV")); it is read twice: once to fit (skipped when a
+    fitted `preprocessor` is passed) and once to transform, with each cleaned chunk appended
+    straight to the output CSV. Only one chunk is in memory at a time. No EDA is rendered.
+    Returns the path of the cleaned CSV.
+    """
+    logging.info("Starting chunked preprocessing...")
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    if preprocessor is None:
+        preprocessor = fit_preprocessor_chunked(make_chunks(), sketch_k=sketch_k, mode_capacity=mode_capacity)
+    preprocessor.save(os.path.join(output_dir, "preprocessor.npz"))
+
+    clean_file = os.path.join(output_dir, f"cleaned_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    tmp_file = clean_file + ".tmp"
+    rows = 0
+    try:
+        with open(tmp_file, "w", newline="") as f:
+            for chunk in make_chunks():
+                preprocessor.transform(chunk).to_csv(f, index=False, header=rows == 0)
+                rows += len(chunk)
+        os.replace(tmp_file, clean_file)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    logging.info(f"Chunked preprocessing took {time.perf_counter() - start:.2f} sec for {rows} rows. "
+                 f"Cleaned data saved at {clean_file}")
+    return clean_file
+
+# ---------------------
+# Memory instrumentation
+# ---------------------
+def _reset_peak_rss():
+    """Reset the kernel's peak-RSS counter (Linux); elsewhere the peak is process-wide."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class MemoryProfile:
+    """
+    Per-step peak RSS and allocated bytes (tracemalloc, which also sees NumPy buffers).
+    allocated_mb is the step's allocation high-water mark above what was live when it started;
+    retained_mb is what was still live when it ended.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+
+    @contextmanager
+    def step(self, name: str):
+        _reset_peak_rss()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.steps.append({
+                "step": name,
+                "seconds": round(time.perf_counter() - start, 3),
+                "peak_rss_mb": round(_peak_rss_mb(), 1),
+                "allocated_mb": round((peak - base) / 1e6, 1),
+                "retained_mb": round((current - base) / 1e6, 1),
+            })
+
+    def stop(self):
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.steps)
+
+def eda_sample(df: pd.DataFrame, sample_size=None, stratify_col="Exited", seed=42) -> pd.DataFrame:
+    """
+    Reproducible sample of at most `sample_size` rows for plotting, stratified on
+    `stratify_col` (when present) so class proportions are kept. Row order is preserved.
+    """
+    if not sample_size or len(df) <= sample_size:
+        return df
+    rng = np.random.default_rng(seed)
+    if stratify_col in df.columns:
+        codes, _ = pd.factorize(df[stratify_col], use_na_sentinel=False)
+        picked = []
+        for code in np.unique(codes):
+            members = np.flatnonzero(codes == code)
+            take = max(1, int(round(sample_size * len(members) / len(df))))
+            picked.append(rng.choice(members, size=min(take, len(members)), replace=False))
+        positions = np.sort(np.concatenate(picked))
+    else:
+        positions = np.sort(rng.choice(len(df), size=sample_size, replace=False))
+    return df.iloc[positions]
+
+def _eda_page(kind: str, title: str, data):
+    """Build one EDA page as a Figure; picklable so pages can be built in worker processes."""
+    if kind == "heatmap":
+        fig = Figure(figsize=(10, 8))
+        ax = fig.subplots()
+        sns.heatmap(data, annot=False, cmap="coolwarm", linewidths=0.5, ax=ax)
+    else:
+        fig = Figure(figsize=(6, 4))
+        ax = fig.subplots()
+        if kind == "hist":
+            sns.histplot(data, kde=True, bins=30, ax=ax)
+        elif kind == "count":
+            sns.countplot(x=data, ax=ax)
+        else:
+            sns.boxplot(x=data, ax=ax)
+    ax.set_title(title)
+    return fig
+
+def render_eda_report(df: pd.DataFrame, continuous_numeric_cols, categorical_int_cols, pdf_file: str,
+                      sample_size=None, workers=1, seed=42, corr=None):
+    """
+    Render the EDA figures into a single PDF. Figures are built with matplotlib.figure.Figure
+    instead of pyplot, so this runs the same inline or in a background worker process.
+    Plots use a reproducible stratified sample of `sample_size` rows (all rows when None);
+    the correlation heatmap uses `corr` when given (computed on the full data by the caller).
+    With `workers` > 1 the pages are built in a process pool and written in order.
+    """
+    logging.info("Creating EDA visualizations and saving to PDF...")
+    start = time.perf_counter()
+    plot_df = eda_sample(df, sample_size, seed=seed)
+    if corr is None:
+        corr = df[continuous_numeric_cols].corr()
+
+    # Same page order as before: distributions, countplots, heatmap, boxplots
+    pages = [("hist", f"Distribution of {col}", plot_df[col]) for col in continuous_numeric_cols]
+    pages += [("count", f"Countplot of {col}", plot_df[col]) for col in categorical_int_cols]
+    pages += [("heatmap", "Correlation Heatmap (Continuous Features)", corr)]
+    pages += [("box", f"Boxplot of {col}", plot_df[col]) for col in continuous_numeric_cols]
+
+    with PdfPages(pdf_file) as pdf:
+        if workers and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for fig in pool.map(_eda_page, *zip(*pages)):
+                    pdf.savefig(fig)
+        else:
+            for page in pages:
+                pdf.savefig(_eda_page(*page))
+
+    logging.info(f"EDA PDF report saved at {pdf_file} ({len(pages)} pages from {len(plot_df)} of {len(df)} rows)")
+    logging.info(f"EDA rendering took {time.perf_counter() - start:.2f} sec")
+    return pdf_file
+
+def preprocess_and_eda(df: pd.DataFrame, output_dir="preprocessing_reports", report_mode="inline",
+                       eda_sample_size=None, eda_workers=1, copy_free=False, profile_memory=False):
     """
     Preprocess churn dataset: clean, handle missing values, encode, scale numeric data, and perform EDA.
     Input: Validated dataframe (not CSV file).
     Output: Clean processed dataframe + PDF with visualizations + summary stats CSV.
+    report_mode: "inline" renders the EDA PDF before returning, "background" hands it to the
+    report queue (collect with reporting.ReportQueue.wait_for_reports), "skip" renders nothing.
+    eda_sample_size / eda_workers: plot from a reproducible sample and build pages in parallel;
+    summary statistics and correlations always use the full data.
+    copy_free: transform without a deep copy (copy-on-write) and write compact float32/int outputs.
+    profile_memory: log per-step peak RSS and allocations and save them to memory_profile.csv
+    (tracemalloc slows allocation-heavy steps such as to_csv considerably; use for diagnosis).
     """
     logging.info("Starting preprocessing and EDA...")
+    start = time.perf_counter()
     os.makedirs(output_dir, exist_ok=True)
+    profile = MemoryProfile() if profile_memory else None
+    step = profile.step if profile else lambda name: nullcontext()
+    input_mb = df.memory_usage(deep=True).sum() / 1e6
 
-    df = df.copy()
-
-    # --- Define column groups ---
-    categorical_int_cols = ["NumOfProducts", "HasCrCard", "IsActiveMember", "Exited"]
-    id_cols = ["RowNumber", "CustomerId", "Surname"]  # identifiers to exclude
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-    # Continuous numeric features (exclude categorical-like ints + IDs)
-    continuous_numeric_cols = [c for c in numeric_cols if c not in categorical_int_cols + id_cols]
-
-    # --- Handle missing values ---
-    logging.info("Handling missing values...")
-    for col in continuous_numeric_cols:
-        df[col] = df[col].fillna(df[col].median())
-    for col in categorical_int_cols:
-        df[col] = df[col].fillna(df[col].mode()[0])
-    for col in df.select_dtypes(include=["object"]).columns:
-        df[col] = df[col].fillna(df[col].mode()[0])
-
-    # --- Encode categorical string variables ---
-    logging.info("Encoding categorical string variables...")
-    categorical_str_cols = df.select_dtypes(include=["object"]).columns
-    le = LabelEncoder()
-    for col in categorical_str_cols:
-        df[col] = le.fit_transform(df[col])
-
-    # --- Normalize continuous numeric attributes only ---
-    logging.info("Normalizing continuous numeric attributes...")
-    scaler = StandardScaler()
-    df[continuous_numeric_cols] = scaler.fit_transform(df[continuous_numeric_cols])
+    # --- Fit and apply imputation, encoding and scaling ---
+    logging.info("Handling missing values, encoding categorical string variables, normalizing continuous numeric attributes...")
+    with step("fit"):
+        preprocessor = ChurnPreprocessor().fit(df)
+    with step("transform"):
+        df = preprocessor.transform(df, copy=not copy_free, compact=copy_free)
+    preprocessor.save(os.path.join(output_dir, "preprocessor.npz"))
+    continuous_numeric_cols = preprocessor.continuous_cols
+    categorical_int_cols = CATEGORICAL_INT_COLS
 
     # --- Summary statistics ---
     logging.info("Generating summary statistics...")
-    summary_stats = df.describe(include="all")
-    summary_file = os.path.join(output_dir, "summary_statistics.csv")
-    summary_stats.to_csv(summary_file)
+    with step("summary_statistics"):
+        summary_stats = df.describe(include="all")
+        summary_file = os.path.join(output_dir, "summary_statistics.csv")
+        summary_stats.to_csv(summary_file)
 
-    # --- EDA Visualizations into Single PDF ---
-    logging.info("Creating EDA visualizations and saving to PDF...")
-    pdf_file = os.path.join(output_dir, f"eda_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    with PdfPages(pdf_file) as pdf:
+    # --- Save Cleaned Data ---
+    with step("save_cleaned_csv"):
+        clean_file = os.path.join(output_dir, f"cleaned_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        df.to_csv(clean_file, index=False)
+    logging.info(f"Preprocessing took {time.perf_counter() - start:.2f} sec")
 
-        # Distribution plots for continuous features
-        for col in continuous_numeric_cols:
-            plt.figure(figsize=(6, 4))
-            sns.histplot(df[col], kde=True, bins=30)
-            plt.title(f"Distribution of {col}")
-            pdf.savefig()
-            plt.close()
-
-        # Countplots for categorical int features
-        for col in categorical_int_cols:
-            plt.figure(figsize=(6, 4))
-            sns.countplot(x=df[col])
-            plt.title(f"Countplot of {col}")
-            pdf.savefig()
-            plt.close()
-
-        # Correlation heatmap (only continuous features)
-        plt.figure(figsize=(10, 8))
+    # --- EDA Visualizations into Single PDF ---
+    with step("eda"):
+        pdf_file = os.path.join(output_dir, f"eda_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+        plot_cols = continuous_numeric_cols + [c for c in categorical_int_cols if c in df.columns]
+        plot_df = eda_sample(df[plot_cols], eda_sample_size)
         corr = df[continuous_numeric_cols].corr()
-        sns.heatmap(corr, annot=False, cmap="coolwarm", linewidths=0.5)
-        plt.title("Correlation Heatmap (Continuous Features)")
-        pdf.savefig()
-        plt.close()
-
-        # Boxplots for outliers (continuous only)
-        for col in continuous_numeric_cols:
-            plt.figure(figsize=(6, 4))
-            sns.boxplot(x=df[col])
-            plt.title(f"Boxplot of {col}")
-            pdf.savefig()
-            plt.close()
+        run_report(report_mode, render_eda_report, plot_df, continuous_numeric_cols, categorical_int_cols, pdf_file,
+                   workers=eda_workers, corr=corr)
 
-    # --- Save Cleaned Data ---
-    clean_file = os.path.join(output_dir, f"cleaned_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-    df.to_csv(clean_file, index=False)
+    if profile:
+        profile.stop()
+        memory = profile.to_frame()
+        memory["allocated_vs_input"] = (memory["allocated_mb"] / input_mb).round(2)
+        memory.to_csv(os.path.join(output_dir, "memory_profile.csv"), index=False)
+        logging.info(f"Memory profile (input frame {input_mb:.1f} MB):\n{memory.to_string(index=False)}")
 
     logging.info(f"Preprocessing and EDA completed. Cleaned data saved at {clean_file}")
-    logging.info(f"EDA PDF report saved at {pdf_file}")
 
     return df
 
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+import sys
+import numpy as np
+import pandas as pd
+
+# ---------------------
+# Declared churn schema shared by all stages
+# ---------------------
+CHURN_SCHEMA = {
+    "RowNumber": "int32",
+    "CustomerId": "int32",
+    "Surname": "category",
+    "CreditScore": "int16",
+    "Geography": "category",
+    "Gender": "category",
+    "Age": "int16",
+    "Tenure": "int8",
+    "Balance": "float64",
+    "NumOfProducts": "int8",
+    "HasCrCard": "int8",
+    "IsActiveMember": "int8",
+    "EstimatedSalary": "float64",
+    "Exited": "int8",
+}
+
+def parse_dtypes(schema=CHURN_SCHEMA):
+    """
+    Dtypes that are safe to hand to the CSV parser directly. Narrow ints are left out because
+    the parser silently wraps out-of-range values (e.g. 300 -> 44 for int8), which would hide
+    exactly the anomalies validation looks for; they are downcast by apply_churn_schema instead.
+    """
+    return {col: dtype for col, dtype in schema.items() if not dtype.startswith("int")}
+
+def _object_nbytes(series: pd.Series) -> int:
+    """Approximate footprint the column would have as object strings, without materializing them."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = np.bincount(series.cat.codes[series.cat.codes >= 0], minlength=len(series.cat.categories))
+        sizes = np.array([sys.getsizeof(v) for v in series.cat.categories], dtype=np.int64)
+        return int(counts @ sizes) + 8 * len(series)
+    return 8 * len(series)
+
+def default_memory_usage(df: pd.DataFrame) -> int:
+    """Estimated bytes of `df` with pandas' default object/int64/float64 dtypes."""
+    return sum(_object_nbytes(df[col]) for col in df.columns) + int(df.index.memory_usage())
+
+def apply_churn_schema(df: pd.DataFrame, schema=CHURN_SCHEMA, log=True) -> pd.DataFrame:
+    """
+    Cast known churn columns to their compact dtypes in place of the originals.
+    Integer columns are only narrowed when every value fits; columns with missing values use
+    the matching nullable integer dtype. Unknown columns are left untouched.
+    """
+    before = default_memory_usage(df) if log else 0
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        series = df[col]
+        if dtype == "category":
+            df[col] = series.astype("category")
+        elif dtype.startswith("int"):
+            if not pd.api.types.is_numeric_dtype(series):
+                logging.warning(f"{col} is not numeric ({series.dtype}); keeping it as is")
+                continue
+            info = np.iinfo(dtype)
+            valid = series.dropna()
+            if len(valid) and (valid.min() < info.min or valid.max() > info.max or (valid % 1 != 0).any()):
+                logging.warning(f"{col} has values outside {dtype}; keeping {series.dtype}")
+                continue
+            df[col] = series.astype(dtype.capitalize() if series.isna().any() else dtype)
+        else:
+            df[col] = series.astype(dtype)
+    if log:
+        after = int(df.memory_usage(deep=True).sum())
+        logging.info(f"Churn schema applied: memory {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB")
+    return df
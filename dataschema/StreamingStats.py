@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+
+# ---------------------
+# Mergeable streaming statistics shared by the validation and preparation stages
+# ---------------------
+class KLLSketch:
+    """
+    Mergeable KLL quantile sketch. Keeps O(k log n) weighted samples; rank error is about 1/k.
+    Compaction works on whole NumPy arrays, so updating with a chunk is vectorized.
+    `variance` bounds the variance of the rank error: each compaction at level h moves any
+    rank by 0 or +-2**h with equal odds, so it adds at most 4**h.
+    """
+
+    def __init__(self, k=256, seed=0):
+        self.k = k
+        self.n = 0
+        self.variance = 0.0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                keep = items[:1] if len(items) % 2 else items[:0]
+                items = items[len(keep):]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+                self.variance += 4.0 ** level
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.variance += other.variance
+        self._compress()
+        return self
+
+    def rank_error(self) -> float:
+        """Standard deviation bound of the rank error of rank() / quantile()."""
+        return float(np.sqrt(self.variance))
+
+    def to_arrays(self) -> dict:
+        """Flat arrays for np.savez: the items, the size of each level and [n, k, variance]."""
+        return {"items": np.concatenate(self.levels), "levels": np.array([len(l) for l in self.levels]),
+                "stats": np.array([self.n, self.k, self.variance], dtype="float64")}
+
+    @classmethod
+    def from_arrays(cls, items, levels, stats):
+        n, k, variance = stats
+        sketch = cls(int(k))
+        sketch.n, sketch.variance = int(n), float(variance)
+        sketch.levels = np.split(np.asarray(items, dtype="float64"), np.cumsum(levels)[:-1])
+        return sketch
+
+    def _cumulative(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(l), 2.0 ** i) for i, l in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def rank(self, x):
+        """Approximate number of values <= x (x may be an array)."""
+        items, cumulative = self._cumulative()
+        return np.concatenate([[0.0], cumulative])[np.searchsorted(items, x, side="right")]
+
+    def quantile(self, q, removed=None):
+        """
+        Approximate q-quantile. With `removed` (a sketch of values deleted from the stream since),
+        the quantile of the remaining values: ranks are this sketch's minus the removed one's.
+        """
+        if self.n - (removed.n if removed is not None else 0) <= 0:
+            return np.nan
+        items, cumulative = self._cumulative()
+        if removed is not None and removed.n:
+            cumulative = np.maximum.accumulate(cumulative - removed.rank(items))
+        idx = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[min(idx, len(items) - 1)])
+
+class Moments:
+    """Count, min/max and mean/M2 merged with Chan's parallel form of Welford's algorithm."""
+
+    def __init__(self):
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max = np.inf, -np.inf
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        if len(values):
+            other = Moments()
+            other.n = len(values)
+            other.mean = float(values.mean())
+            other.m2 = float(((values - other.mean) ** 2).sum())
+            other.min, other.max = float(values.min()), float(values.max())
+            self.merge(other)
+
+    def merge(self, other):
+        if other.n:
+            n = self.n + other.n
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+            self.n = n
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        return self
+
+    def remove(self, values):
+        """
+        Retract values added earlier (merge in reverse). min/max are left as they were: if a
+        removed value was an extreme, the caller has to recompute it from the data.
+        """
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        n = self.n - len(values)
+        if n <= 0:
+            self.__init__()
+            return self
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        rest_mean = (self.n * self.mean - len(values) * mean) / n
+        delta = mean - rest_mean
+        self.m2 = max(self.m2 - m2 - delta ** 2 * n * len(values) / self.n, 0.0)
+        self.n, self.mean = n, rest_mean
+        return self
+
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
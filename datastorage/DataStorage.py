@@ -5,9 +5,25 @@
 
 
 import os
+import time
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+import pyarrow.dataset as ds
+import operator
+import uuid
+import threading
+import gzip
+import json
+from dataschema.ChurnSchema import parse_dtypes, apply_churn_schema
+
+try:
+    import zstandard
+except ImportError:  # zstd compression for NDJSON is optional
+    zstandard = None
 import logging
-from datetime import datetime
+from datetime import datetime, date
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,20 +44,334 @@ def get_partitioned_path(base_dir: str, source: str, ext: str) -> str:
         f"day={now.day:02d}"
     )
     ensure_dir(folder)
-    return os.path.join(folder, f"{source}_DataStorage.{ext}")
+    return os.path.join(folder, part_file_name(source, ext))
+
+def part_file_name(source: str, ext: str, timestamp: str = None) -> str:
+    """
+    Unique part file name. The leading timestamp makes name order equal write order, so
+    later runs on the same day never overwrite earlier ones and "last" is well defined.
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d%H%M%S%f")
+    return f"{source}_DataStorage_part-{timestamp}-{uuid.uuid4().hex[:8]}.{ext}"
+
+def _is_temp_file(name: str) -> bool:
+    return name.startswith(".") or name.endswith(".tmp")
+
+def atomic_write(path: str, writer):
+    """Call writer(tmp_path) on a hidden temp file in the same folder, then rename it into place."""
+    folder, name = os.path.split(path)
+    tmp_path = os.path.join(folder, f".{name}.tmp")
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
 
 def save_csv_or_db(df: pd.DataFrame, base_dir: str, source: str):
     if not df.empty:
         path = get_partitioned_path(base_dir, source, "csv")
-        df.to_csv(path, index=False)
+        atomic_write(path, lambda tmp: df.to_csv(tmp, index=False))
         logging.info(f"{source.upper()} data stored at {path}")
+        return path
 
 def save_api(data, base_dir: str, source: str):
     if data:
         path = get_partitioned_path(base_dir, source, "json")
-        pd.Series(data).to_json(path, orient="records", indent=2)
+        atomic_write(path, lambda tmp: pd.Series(data).to_json(tmp, orient="records", indent=2))
         logging.info(f"{source.upper()} data stored at {path}")
 
+# ---------------------
+# Streaming NDJSON for API payloads
+# ---------------------
+_NDJSON_EXTS = {None: "ndjson", "gzip": "ndjson.gz", "zstd": "ndjson.zst"}
+
+def _open_ndjson(path: str, mode: str, compression=None):
+    """Text handle on a plain, gzip or zstd NDJSON file (`mode` is "w" or "r")."""
+    if compression is None:
+        compression = "gzip" if path.endswith(".gz") else "zstd" if path.endswith(".zst") else None
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def save_api_stream(batches, base_dir: str, source: str, compression=None):
+    """
+    Write an iterator of record batches (lists of dicts, e.g. from load_api_pages) as
+    newline-delimited JSON, flushing after every batch so only one batch is held in memory.
+    compression: None, "gzip" or "zstd". Returns (path, record count).
+    """
+    if compression not in _NDJSON_EXTS:
+        raise ValueError(f"Unsupported NDJSON compression: {compression}")
+    path = get_partitioned_path(base_dir, source, _NDJSON_EXTS[compression])
+    records = 0
+
+    def write(tmp_path):
+        nonlocal records
+        with _open_ndjson(tmp_path, "w", compression) as f:
+            for batch in batches:
+                f.writelines(json.dumps(r, separators=(",", ":"), default=str) + "\n" for r in batch)
+                f.flush()
+                records += len(batch)
+
+    atomic_write(path, write)
+    logging.info(f"{source.upper()} data stored at {path} ({records} records)")
+    return path, records
+
+def read_api_stream(path: str, batch_size=10_000):
+    """Yield lists of up to `batch_size` records from an NDJSON file written by save_api_stream."""
+    batch = []
+    with _open_ndjson(path, "r") as f:
+        for line in f:
+            if line.strip():
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+def save_columnar(df: pd.DataFrame, base_dir: str, source: str, fmt="parquet", compression="zstd",
+                  row_group_size=100_000):
+    """
+    Store a DataFrame in columnar form under the same year=/month=/day= layout as save_csv_or_db.
+    fmt: "parquet" (row groups of `row_group_size` rows) or "feather" (Arrow IPC).
+    The pandas schema, including category and narrow int dtypes, round-trips through the Arrow metadata.
+    """
+    if df.empty:
+        return None
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        path = get_partitioned_path(base_dir, source, "parquet")
+        atomic_write(path, lambda tmp: pq.write_table(table, tmp, compression=compression,
+                                                      row_group_size=row_group_size))
+    elif fmt == "feather":
+        path = get_partitioned_path(base_dir, source, "feather")
+        atomic_write(path, lambda tmp: feather.write_feather(table, tmp, compression=compression))
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    logging.info(f"{source.upper()} data stored at {path} ({fmt}, {compression})")
+    return path
+
+def read_columnar(path: str, columns=None) -> pd.DataFrame:
+    if path.endswith(".feather"):
+        return feather.read_feather(path, columns=columns)
+    return pq.read_table(path, columns=columns).to_pandas()
+
+# ---------------------
+# Partition-aware reader
+# ---------------------
+_FILTER_OPS = {
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda s, v: s.isin(v), "not in": lambda s, v: ~s.isin(v),
+}
+
+def _to_date(value):
+    return None if value is None else pd.Timestamp(value).date()
+
+def _partition_value(name: str, key: str):
+    prefix = f"{key}="
+    if name.startswith(prefix) and name[len(prefix):].isdigit():
+        return int(name[len(prefix):])
+    return None
+
+def discover_partitions(base_dir: str, source: str, start=None, end=None):
+    """
+    List (date, folder) partitions of `source` between `start` and `end` (inclusive).
+    Whole years and months outside the range are skipped without listing their contents.
+    """
+    start, end = _to_date(start), _to_date(end)
+    root = os.path.join(base_dir, source)
+    partitions = []
+    if not os.path.isdir(root):
+        return partitions
+    for year_entry in os.scandir(root):
+        year = _partition_value(year_entry.name, "year")
+        if year is None or (start and year < start.year) or (end and year > end.year):
+            continue
+        for month_entry in os.scandir(year_entry.path):
+            month = _partition_value(month_entry.name, "month")
+            if month is None or (start and (year, month) < (start.year, start.month)) \
+                    or (end and (year, month) > (end.year, end.month)):
+                continue
+            for day_entry in os.scandir(month_entry.path):
+                day = _partition_value(day_entry.name, "day")
+                if day is None:
+                    continue
+                day_date = date(year, month, day)
+                if (start and day_date < start) or (end and day_date > end):
+                    continue
+                partitions.append((day_date, day_entry.path))
+    return sorted(partitions)
+
+def _apply_filters(df: pd.DataFrame, filters) -> pd.DataFrame:
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in filters:
+        mask &= _FILTER_OPS[op](df[col], value)
+    return df[mask]
+
+def _read_partition_file(path: str, columns=None, filters=None, chunksize=100_000):
+    """Yield frames from one stored file, projecting `columns` and filtering rows while scanning."""
+    filter_cols = [f[0] for f in filters or []]
+    read_cols = None if columns is None else list(dict.fromkeys(list(columns) + filter_cols))
+    if path.endswith((".parquet", ".feather")):
+        fmt = "parquet" if path.endswith(".parquet") else "feather"
+        expression = pq.filters_to_expression(filters) if filters else None
+        scanner = ds.dataset(path, format=fmt).scanner(columns=columns, filter=expression, batch_size=chunksize)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch.to_pandas()
+    elif path.endswith(".csv"):
+        for chunk in pd.read_csv(path, usecols=read_cols, chunksize=chunksize):
+            chunk = _apply_filters(chunk, filters)
+            if len(chunk):
+                yield chunk if columns is None else chunk[list(columns)]
+    elif path.endswith((".ndjson", ".ndjson.gz", ".ndjson.zst")):
+        for batch in read_api_stream(path, chunksize):
+            chunk = _apply_filters(pd.DataFrame.from_records(batch), filters)
+            if len(chunk):
+                yield chunk if columns is None else chunk[list(columns)]
+    elif path.endswith(".json"):
+        df = pd.read_json(path, orient="records")
+        df = _apply_filters(df, filters)
+        if len(df):
+            yield df if columns is None else df[list(columns)]
+
+def read_partitions(base_dir: str, source: str, start=None, end=None, columns=None, filters=None, lazy=False):
+    """
+    Read stored `source/year=YYYY/month=MM/day=DD` data between `start` and `end` (inclusive).
+    Partitions outside the date range are pruned before any file is opened, only `columns`
+    are read, and `filters` ([(column, op, value), ...], ops: = != < <= > >= in, not in) are
+    applied during the scan (pushed down to row groups for Parquet).
+    Returns an iterator of frames when `lazy`, otherwise one concatenated frame.
+    """
+    partitions = discover_partitions(base_dir, source, start, end)
+    logging.info(f"{source.upper()}: {len(partitions)} partitions selected between {start} and {end}")
+
+    def frames():
+        for _, folder in partitions:
+            for name in sorted(os.listdir(folder)):
+                if _is_temp_file(name):
+                    continue
+                yield from _read_partition_file(os.path.join(folder, name), columns, filters)
+
+    if lazy:
+        return frames()
+    parts = list(frames())
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True)
+
+# ---------------------
+# Compaction
+# ---------------------
+_TABULAR_EXTS = (".parquet", ".feather", ".csv")
+
+def compact_partition(folder: str, source: str, key="CustomerId", target_rows=1_000_000,
+                      compression="zstd", min_files=4):
+    """
+    Merge the tabular part files of one partition into as few Parquet files of up to
+    `target_rows` rows as possible, keeping the most recent row per `key`.
+    Only the files read are removed, so parts written concurrently are left for the next pass.
+    The output keeps the compact churn schema and any other categorical columns, however the
+    parts stored them.
+    """
+    parts = sorted(n for n in os.listdir(folder) if n.endswith(_TABULAR_EXTS) and not _is_temp_file(n))
+    paths = [os.path.join(folder, n) for n in parts]
+    # Only small parts trigger a pass; Parquet row counts come from the footer without a scan
+    small = [p for p in paths if not p.endswith(".parquet") or pq.ParquetFile(p).metadata.num_rows < target_rows // 2]
+    if len(parts) < 2 or len(small) < min_files:
+        return []
+    frames = [pd.read_csv(p, dtype=parse_dtypes()) if p.endswith(".csv") else read_columnar(p) for p in paths]
+    categorical = {col for f in frames for col in f.columns if isinstance(f[col].dtype, pd.CategoricalDtype)}
+    df = pd.concat(frames, ignore_index=True)
+    # concat widens categoricals with differing categories to strings and CSV ints to int64
+    df = apply_churn_schema(df, log=False)
+    for col in categorical:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    rows_in = len(df)
+    if key and key in df.columns:
+        df = df.drop_duplicates(subset=key, keep="last", ignore_index=True)
+
+    # Reuse the newest input's timestamp so outputs still sort before parts written after it
+    newest = parts[-1].split("_DataStorage_part-")[-1].split("-")[0]
+    outputs = []
+    for start in range(0, len(df), target_rows):
+        table = pa.Table.from_pandas(df.iloc[start:start + target_rows], preserve_index=False)
+        path = os.path.join(folder, part_file_name(source, "parquet", newest))
+        atomic_write(path, lambda tmp: pq.write_table(table, tmp, compression=compression))
+        outputs.append(path)
+    for path in paths:
+        os.remove(path)
+    logging.info(f"Compacted {len(parts)} files ({rows_in} rows) into {len(outputs)} files ({len(df)} rows) in {folder}")
+    return outputs
+
+def compact_partitions(base_dir: str, source: str, start=None, end=None, **kwargs):
+    """Run compact_partition over every partition of `source` in the date range."""
+    compacted = {}
+    for _, folder in discover_partitions(base_dir, source, start, end):
+        outputs = compact_partition(folder, source, **kwargs)
+        if outputs:
+            compacted[folder] = outputs
+    return compacted
+
+def start_background_compaction(base_dir: str, source: str, interval_seconds=300, **kwargs):
+    """
+    Compact `source` partitions every `interval_seconds` on a daemon thread.
+    Returns a threading.Event; set it to stop the loop.
+    """
+    stop_event = threading.Event()
+
+    def loop():
+        while not stop_event.is_set():
+            try:
+                compact_partitions(base_dir, source, **kwargs)
+            except Exception as e:
+                logging.error(f"Background compaction of {source} failed: {e}")
+            stop_event.wait(interval_seconds)
+
+    threading.Thread(target=loop, name=f"compaction-{source}", daemon=True).start()
+    return stop_event
+
+def benchmark_storage_backends(df: pd.DataFrame, base_dir: str, repeats=3):
+    """
+    Compare write/read time and on-disk size of the CSV path against Parquet and Feather.
+    Returns a DataFrame with one row per backend (best of `repeats` runs).
+    """
+    backends = {
+        "csv": (lambda: save_csv_or_db(df, base_dir, "bench_csv"), pd.read_csv),
+        "parquet_snappy": (lambda: save_columnar(df, base_dir, "bench_parquet_snappy", "parquet", "snappy"), read_columnar),
+        "parquet_zstd": (lambda: save_columnar(df, base_dir, "bench_parquet_zstd", "parquet", "zstd"), read_columnar),
+        "feather_lz4": (lambda: save_columnar(df, base_dir, "bench_feather_lz4", "feather", "lz4"), read_columnar),
+    }
+    results = []
+    for name, (write, read) in backends.items():
+        write_times, read_times = [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            path = write()
+            write_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            read(path)
+            read_times.append(time.perf_counter() - start)
+        results.append({
+            "backend": name,
+            "write_sec": min(write_times),
+            "read_sec": min(read_times),
+            "size_mb": os.path.getsize(path) / 1e6,
+        })
+    results_df = pd.DataFrame(results)
+    logging.info(f"Storage benchmark ({len(df)} rows):\n{results_df.to_string(index=False)}")
+    return results_df
+
 
 # In[8]:
 
@@ -8,109 +8,211 @@ import logging
 import pandas as pd
 from datetime import datetime
 import os
+import json
+import time
+import shutil
+import tempfile
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy import stats
+from concurrent.futures import ProcessPoolExecutor
+from reporting.ReportQueue import run_report
+from dataschema.StreamingStats import KLLSketch, Moments
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-def validate_churn_data(df: pd.DataFrame, output_dir="reports", fmt="csv"):
+# ---------------------
+# Declarative rule registry
+# ---------------------
+# Each rule: column, type, issue label, message template ({n} = violation count) and
+# type-specific parameters. Extra rules can be appended here or loaded with load_rules().
+CHURN_RULES = [
+    {"column": "RowNumber", "type": "monotonic", "issue": "Sequence", "message": "RowNumber not strictly increasing"},
+    {"column": "CustomerId", "type": "unique", "issue": "Uniqueness", "message": "{n} duplicates found"},
+    {"column": "CreditScore", "type": "range", "min": 300, "max": 850, "issue": "Range", "message": "{n} values outside 300–850"},
+    {"column": "Geography", "type": "set", "values": ["France", "Spain", "Germany"], "issue": "Invalid", "message": "{n} invalid values"},
+    {"column": "Gender", "type": "set", "values": ["Male", "Female"], "issue": "Invalid", "message": "{n} invalid values"},
+    {"column": "Age", "type": "range", "min": 18, "max": 100, "issue": "Range", "message": "{n} invalid ages"},
+    {"column": "Tenure", "type": "range", "min": 0, "max": 10, "issue": "Range", "message": "{n} invalid tenures"},
+    {"column": "Balance", "type": "range", "min": 0, "issue": "Negative", "message": "{n} negative balances"},
+    {"column": "NumOfProducts", "type": "range", "min": 1, "max": 4, "issue": "Range", "message": "{n} invalid values"},
+    {"column": "HasCrCard", "type": "binary", "issue": "Binary", "message": "{n} invalid binary values"},
+    {"column": "IsActiveMember", "type": "binary", "issue": "Binary", "message": "{n} invalid binary values"},
+    {"column": "Exited", "type": "binary", "issue": "Binary", "message": "{n} invalid binary values"},
+    {"column": "EstimatedSalary", "type": "quantile", "q": 0.999, "issue": "Anomaly", "message": "{n} extreme outliers"},
+]
+
+def _values(series: pd.Series) -> np.ndarray:
+    """Column as a NumPy array without copying plain numeric columns; missing values become NaN."""
+    if isinstance(series.dtype, np.dtype) or not pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy()
+    return series.to_numpy(dtype="float64", na_value=np.nan)
+
+def _range_mask(series, rule):
+    values = _values(series)
+    mask = np.zeros(len(values), dtype=bool)
+    if rule.get("min") is not None:
+        mask |= values < rule["min"]
+    if rule.get("max") is not None:
+        mask |= values > rule["max"]
+    return mask
+
+def _set_mask(series, rule):
+    allowed = set(rule["values"])
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Look categories up once, then index by code (-1 = missing, never allowed)
+        ok = np.append(series.cat.categories.isin(allowed), False)
+        return ~ok[series.cat.codes.to_numpy()]
+    return ~series.isin(allowed).to_numpy()
+
+def _binary_mask(series, rule):
+    if not pd.api.types.is_numeric_dtype(series):
+        return _set_mask(series, {"values": [0, 1]})
+    return ~np.isin(_values(series), [0, 1])
+
+def _unique_mask(series, rule):
+    return series.duplicated().to_numpy()
+
+def _quantile_mask(series, rule):
+    values = _values(series).astype("float64", copy=False)
+    threshold = np.nanquantile(values, rule["q"]) if len(values) else np.nan
+    return values > threshold
+
+def _monotonic_violation(series, rule):
+    # Dataset-level rule: a single violation when the sequence is not increasing
+    return 0 if series.is_monotonic_increasing else 1
+
+# Row-level rules return a boolean violation mask; dataset-level rules return a count.
+RULE_EVALUATORS = {
+    "range": _range_mask,
+    "set": _set_mask,
+    "binary": _binary_mask,
+    "unique": _unique_mask,
+    "quantile": _quantile_mask,
+    "monotonic": _monotonic_violation,
+}
+
+def register_rule_type(name: str, evaluator):
+    """Add a rule type: evaluator(series, rule) -> boolean violation mask or violation count."""
+    RULE_EVALUATORS[name] = evaluator
+
+def load_rules(path: str):
+    """Read a JSON list of rule dicts in the CHURN_RULES format."""
+    with open(path, "r") as f:
+        rules = json.load(f)
+    for rule in rules:
+        if rule["type"] not in RULE_EVALUATORS:
+            raise ValueError(f"Unknown rule type '{rule['type']}' for column {rule['column']}")
+    return rules
+
+def evaluate_rules(df: pd.DataFrame, rules=None):
     """
-    Validate churn dataset with anomaly checks + general data quality metrics.
+    Evaluate all rules column by column. Violations are counted from mask sums, so no
+    offending rows are ever materialized. Returns [(rule, count, mask or None), ...] for
+    rules whose column exists.
     """
-    logging.info("===== Validation started =====")
+    rules = CHURN_RULES if rules is None else rules
+    by_column = {}
+    for rule in rules:
+        by_column.setdefault(rule["column"], []).append(rule)
 
-    issues = []
+    results = []
+    for column, column_rules in by_column.items():
+        if column not in df.columns:
+            logging.warning(f"Skipping rules for missing column {column}")
+            continue
+        series = df[column]
+        for rule in column_rules:
+            outcome = RULE_EVALUATORS[rule["type"]](series, rule)
+            if isinstance(outcome, np.ndarray):
+                results.append((rule, int(np.count_nonzero(outcome)), outcome))
+            else:
+                results.append((rule, int(outcome), None))
+    return results
 
-    # --- Rule-based checks ---
-    logging.info("Starting check: RowNumber sequence")
-    if not df["RowNumber"].is_monotonic_increasing:
-        issues.append(["RowNumber", "Sequence", "RowNumber not strictly increasing"])
-        logging.warning("RowNumber anomalies detected")
-    logging.info("Completed check: RowNumber sequence")
+def count_duplicate_rows(df: pd.DataFrame) -> int:
+    # Rows cannot repeat when CustomerId is unique, which skips hashing every full row
+    if "CustomerId" in df.columns and df["CustomerId"].is_unique:
+        return 0
+    return int(df.duplicated().sum())
 
-    logging.info("Starting check: CustomerId uniqueness")
-    if df["CustomerId"].duplicated().any():
-        dupes = df["CustomerId"].duplicated().sum()
-        issues.append(["CustomerId", "Uniqueness", f"{dupes} duplicates found"])
-        logging.warning(f"CustomerId anomalies detected: {dupes} duplicates")
-    logging.info("Completed check: CustomerId uniqueness")
-
-    logging.info("Starting check: CreditScore validity")
-    bad_credit = df[(df["CreditScore"] < 300) | (df["CreditScore"] > 850)]
-    if not bad_credit.empty:
-        issues.append(["CreditScore", "Range", f"{len(bad_credit)} values outside 300–850"])
-        logging.warning(f"CreditScore anomalies detected: {len(bad_credit)} rows")
-    logging.info("Completed check: CreditScore validity")
-
-    logging.info("Starting check: Geography validity")
-    valid_geo = {"France", "Spain", "Germany"}
-    bad_geo = df[~df["Geography"].isin(valid_geo)]
-    if not bad_geo.empty:
-        issues.append(["Geography", "Invalid", f"{len(bad_geo)} invalid values"])
-        logging.warning(f"Geography anomalies detected: {len(bad_geo)} rows")
-    logging.info("Completed check: Geography validity")
-
-    logging.info("Starting check: Gender validity")
-    valid_gender = {"Male", "Female"}
-    bad_gender = df[~df["Gender"].isin(valid_gender)]
-    if not bad_gender.empty:
-        issues.append(["Gender", "Invalid", f"{len(bad_gender)} invalid values"])
-        logging.warning(f"Gender anomalies detected: {len(bad_gender)} rows")
-    logging.info("Completed check: Gender validity")
-
-    logging.info("Starting check: Age range")
-    bad_age = df[(df["Age"] < 18) | (df["Age"] > 100)]
-    if not bad_age.empty:
-        issues.append(["Age", "Range", f"{len(bad_age)} invalid ages"])
-        logging.warning(f"Age anomalies detected: {len(bad_age)} rows")
-    logging.info("Completed check: Age range")
-
-    logging.info("Starting check: Tenure range")
-    bad_tenure = df[(df["Tenure"] < 0) | (df["Tenure"] > 10)]
-    if not bad_tenure.empty:
-        issues.append(["Tenure", "Range", f"{len(bad_tenure)} invalid tenures"])
-        logging.warning(f"Tenure anomalies detected: {len(bad_tenure)} rows")
-    logging.info("Completed check: Tenure range")
-
-    logging.info("Starting check: Balance non-negative")
-    bad_balance = df[df["Balance"] < 0]
-    if not bad_balance.empty:
-        issues.append(["Balance", "Negative", f"{len(bad_balance)} negative balances"])
-        logging.warning(f"Balance anomalies detected: {len(bad_balance)} rows")
-    logging.info("Completed check: Balance non-negative")
-
-    logging.info("Starting check: NumOfProducts range")
-    bad_products = df[(df["NumOfProducts"] < 1) | (df["NumOfProducts"] > 4)]
-    if not bad_products.empty:
-        issues.append(["NumOfProducts", "Range", f"{len(bad_products)} invalid values"])
-        logging.warning(f"NumOfProducts anomalies detected: {len(bad_products)} rows")
-    logging.info("Completed check: NumOfProducts range")
+# ---------------------
+# Row-level violation index
+# ---------------------
+def rule_name(rule) -> str:
+    return f"{rule['column']}.{rule['type']}"
 
-    for col in ["HasCrCard", "IsActiveMember", "Exited"]:
-        logging.info(f"Starting check: {col} binary values")
-        bad_binary = df[~df[col].isin([0, 1])]
-        if not bad_binary.empty:
-            issues.append([col, "Binary", f"{len(bad_binary)} invalid binary values"])
-            logging.warning(f"{col} anomalies detected: {len(bad_binary)} rows")
-        logging.info(f"Completed check: {col} binary values")
-
-    logging.info("Starting check: EstimatedSalary outliers")
-    high_salary = df[df["EstimatedSalary"] > df["EstimatedSalary"].quantile(0.999)]
-    if not high_salary.empty:
-        issues.append(["EstimatedSalary", "Anomaly", f"{len(high_salary)} extreme outliers"])
-        logging.warning(f"EstimatedSalary anomalies detected: {len(high_salary)} rows")
-    logging.info("Completed check: EstimatedSalary outliers")
-
-    # Convert issues to DataFrame
-    issues_df = pd.DataFrame(issues, columns=["Column", "IssueType", "Details"])
-
-    # --- General dataset quality metrics ---
-    report = {}
-    report["missing_values"] = df.isnull().sum().to_dict()
-    report["duplicate_rows"] = int(df.duplicated().sum())
-    report["data_types"] = df.dtypes.apply(lambda x: str(x)).to_dict()
-    report["numeric_summary"] = df.describe(include=["number"]).to_dict()
+class ViolationIndex:
+    """
+    One packed bitset (np.packbits, 1 bit per row, aligned to row order) per row-level rule.
+    Lets quarantine/fix-up steps select clean or violating rows, or combine rules with
+    AND/OR, without re-evaluating any predicate.
+    """
+
+    def __init__(self, n_rows: int, bitsets=None):
+        self.n_rows = n_rows
+        self.bitsets = dict(bitsets or {})
+
+    @classmethod
+    def from_results(cls, n_rows, results):
+        return cls(n_rows, {rule_name(rule): np.packbits(mask) for rule, _, mask in results if mask is not None})
+
+    @property
+    def rules(self):
+        return list(self.bitsets)
 
+    def mask(self, rule: str) -> np.ndarray:
+        return np.unpackbits(self.bitsets[rule], count=self.n_rows).astype(bool)
+
+    def combine(self, rules=None, how="or") -> np.ndarray:
+        """Boolean row mask of rows violating any ("or") or all ("and") of `rules` (default: every rule)."""
+        if how not in ("or", "and"):
+            raise ValueError(f"how must be 'or' or 'and', got {how!r}")
+        rules = self.rules if rules is None else rules
+        if not rules:
+            return np.zeros(self.n_rows, dtype=bool)
+        op = np.bitwise_or if how == "or" else np.bitwise_and
+        packed = self.bitsets[rules[0]].copy()
+        for rule in rules[1:]:
+            op(packed, self.bitsets[rule], out=packed)
+        return np.unpackbits(packed, count=self.n_rows).astype(bool)
+
+    def count(self, rule: str) -> int:
+        return int(np.unpackbits(self.bitsets[rule], count=self.n_rows).sum())
+
+    def violating_rows(self, df: pd.DataFrame, rules=None, how="or") -> pd.DataFrame:
+        if isinstance(rules, str):
+            rules = [rules]
+        return df[self.combine(rules, how)]
+
+    def clean_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[~self.combine()]
+
+    def save(self, path: str):
+        np.savez_compressed(path, n_rows=self.n_rows, names=np.array(self.rules), **{f"r{i}": b for i, b in enumerate(self.bitsets.values())})
+        return path
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            names = [str(n) for n in data["names"]]
+            return cls(int(data["n_rows"]), {name: data[f"r{i}"] for i, name in enumerate(names)})
+
+def _issues_from_counts(rule_counts):
+    """Issue rows (and warnings) for rules with at least one violation."""
+    issues = []
+    for rule, count in rule_counts:
+        if count:
+            issues.append([rule["column"], rule["issue"], rule["message"].format(n=count)])
+            logging.warning(f"{rule['column']} anomalies detected: {count} rows")
+        logging.info(f"Completed check: {rule['column']} {rule['type']}")
+    return pd.DataFrame(issues, columns=["Column", "IssueType", "Details"])
+
+def save_validation_reports(issues_df: pd.DataFrame, report: dict, output_dir="reports"):
+    """Write the issues CSV, metadata CSV and PDF quality report; returns their paths."""
     # Save reports
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -131,26 +233,1214 @@ def validate_churn_data(df: pd.DataFrame, output_dir="reports", fmt="csv"):
     c.setFont("Helvetica", 10)
 
     y = 730
+    bottom_margin = 40
+
+    def line(x, text, step):
+        # Start a new page instead of drawing below the bottom edge
+        nonlocal y
+        if y < bottom_margin:
+            c.showPage()
+            c.setFont("Helvetica", 10)
+            y = 750
+        c.drawString(x, y, text)
+        y -= step
+
     for section, details in report.items():
-        c.drawString(30, y, f"{section.upper()}:")
-        y -= 15
+        line(30, f"{section.upper()}:", 15)
         if isinstance(details, dict):
             for k, v in details.items():
-                c.drawString(50, y, f"{k}: {v}")
-                y -= 12
+                line(50, f"{k}: {v}", 12)
         else:
-            c.drawString(50, y, str(details))
-            y -= 12
+            line(50, str(details), 12)
         y -= 8
     c.save()
 
     logging.info(f"Issues report saved at {issues_file}")
     logging.info(f"Metadata report saved at {meta_file}")
     logging.info(f"PDF report saved at {pdf_file}")
+    return issues_file, meta_file, pdf_file
+
+def validate_churn_data(df: pd.DataFrame, output_dir="reports", fmt="csv", rules=None, workers=None,
+                        return_index=False, save_index=False, report_mode="inline", profile=True):
+    """
+    Validate churn dataset with anomaly checks + general data quality metrics.
+    `rules` defaults to CHURN_RULES. With `workers` > 1 the rows are sharded across a
+    process pool (see validate_churn_data_parallel); the index and profile options apply there too.
+    With `return_index` a ViolationIndex of the row-level rules is returned as a third value;
+    `save_index` also writes it next to the reports.
+    report_mode: "inline" writes the reports before returning, "background" hands them to the
+    report queue (collect with reporting.ReportQueue.wait_for_reports), "skip" writes none.
+    Unless `profile` is False, a distribution profile for later drift checks (check_drift) is
+    written like the reports, so it follows report_mode.
+    """
+    logging.info("===== Validation started =====")
+    index = None
+    if workers and workers > 1:
+        outcome = validate_churn_data_parallel(df, output_dir, fmt, rules, workers, report_mode,
+                                               return_index=return_index or save_index)
+        issues_df, report = outcome[:2]
+        if return_index or save_index:
+            index = outcome[2]
+    else:
+        # --- Rule-based checks ---
+        results = evaluate_rules(df, rules)
+        issues_df = _issues_from_counts((rule, count) for rule, count, _ in results)
+
+        # --- General dataset quality metrics ---
+        report = {}
+        report["missing_values"] = df.isnull().sum().to_dict()
+        report["duplicate_rows"] = count_duplicate_rows(df)
+        report["data_types"] = df.dtypes.apply(lambda x: str(x)).to_dict()
+        report["numeric_summary"] = df.describe(include=["number"]).to_dict()
+
+        run_report(report_mode, save_validation_reports, issues_df, report, output_dir)
+        if return_index or save_index:
+            index = ViolationIndex.from_results(len(df), results)
+
+    if profile:
+        run_report(report_mode, write_profile, df, output_dir)
+
+    if save_index:
+        # The reports may be skipped or still queued, so they cannot be relied on to create output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        index_file = os.path.join(output_dir, f"churn_data_violations_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npz")
+        index.save(index_file)
+        logging.info(f"Violation index saved at {index_file}")
     logging.info("===== Validation completed =====")
 
+    if return_index:
+        return issues_df, report, index
+    return issues_df, report
+
+# ---------------------
+# Out-of-core (chunked) validation
+# ---------------------
+class HashPartitions:
+    """
+    Multiset of 64-bit row/key hashes for duplicate counting in bounded memory. Hashes are
+    buffered up to `buffer_size` and then spilled to `partitions` files split on the top hash
+    bits, so duplicates() only holds one partition at a time (~1/partitions of all hashes).
+    Merging adopts the other instance's spill files; close() removes them.
+    """
+
+    def __init__(self, buffer_size=1 << 20, partitions=64, spill_dir=None):
+        if partitions & (partitions - 1):
+            raise ValueError("partitions must be a power of two")
+        self.buffer_size = buffer_size
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.buffer = []
+        self.buffered = 0
+        self.own_dir = None
+        self.dirs = []
+
+    def add(self, hashes: np.ndarray):
+        self.buffer.append(np.asarray(hashes, dtype=np.uint64))
+        self.buffered += len(hashes)
+        if self.buffered >= self.buffer_size:
+            self.spill()
+
+    def spill(self):
+        if not self.buffered:
+            return
+        if self.own_dir is None:
+            self.own_dir = tempfile.mkdtemp(prefix="churn_hashes_", dir=self.spill_dir)
+            self.dirs.append(self.own_dir)
+        # Sorting groups the partitions (top bits) into contiguous runs
+        hashes = np.sort(np.concatenate(self.buffer))
+        self.buffer, self.buffered = [], 0
+        bits = self.partitions.bit_length() - 1
+        keys = hashes >> np.uint64(64 - bits) if bits else np.zeros(len(hashes), dtype=np.uint64)
+        bounds = np.searchsorted(keys, np.arange(self.partitions + 1, dtype=np.uint64))
+        for part in range(self.partitions):
+            if bounds[part + 1] > bounds[part]:
+                with open(os.path.join(self.own_dir, f"{part}.u64"), "ab") as f:
+                    hashes[bounds[part]:bounds[part + 1]].tofile(f)
+
+    def merge(self, other):
+        self.dirs.extend(other.dirs)
+        other.dirs = []
+        self.buffer.extend(other.buffer)
+        self.buffered += other.buffered
+        if self.buffered >= self.buffer_size:
+            self.spill()
+        return self
+
+    @staticmethod
+    def _count(hashes):
+        hashes = np.sort(hashes)
+        return int(np.count_nonzero(hashes[1:] == hashes[:-1]))
+
+    def duplicates(self) -> int:
+        """Number of hashes equal to an earlier one."""
+        if not self.dirs:
+            return self._count(np.concatenate(self.buffer)) if self.buffer else 0
+        self.spill()
+        total = 0
+        for part in range(self.partitions):
+            files = [os.path.join(d, f"{part}.u64") for d in self.dirs]
+            parts = [np.fromfile(f, dtype=np.uint64) for f in files if os.path.exists(f)]
+            if parts:
+                total += self._count(np.concatenate(parts))
+        return total
+
+    def close(self):
+        for d in self.dirs:
+            shutil.rmtree(d, ignore_errors=True)
+        self.dirs, self.own_dir, self.buffer, self.buffered = [], None, [], 0
+
+def _tail_quantile_count(tail, n, q):
+    """Values above the q-quantile of n values whose sorted top is `tail`; None if the tail is too short."""
+    if n == 0:
+        return 0
+    pos = q * (n - 1)
+    lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+    first = n - len(tail)
+    if lo < first:
+        return None
+    x_lo, x_hi, g = tail[lo - first], tail[hi - first], pos - lo
+    # Same interpolation as np.quantile, so ties at the threshold are counted alike
+    threshold = x_lo + (x_hi - x_lo) * g if g < 0.5 else x_hi - (x_hi - x_lo) * (1 - g)
+    return int(np.count_nonzero(tail > threshold))
+
+class ChunkedValidationState:
+    """
+    Mergeable partial state for validating a dataset chunk by chunk: per-rule violation
+    counts, missing counts, moments and KLL sketches per numeric column, and 64-bit hashes
+    for the uniqueness / duplicate-row checks. The hashes spill to disk past `spill_rows` per
+    check (HashPartitions), so memory stays bounded; call close() to remove the spill files.
+    States built on separate chunks (or shards) can be merged before finalize(). With `keep_masks` the row-level rule masks are also kept,
+    packed and in row order, for building a ViolationIndex (see row_masks()).
+    """
+
+    def __init__(self, rules=None, tail_size=100_000, sketch_k=256, keep_masks=False, spill_rows=1 << 20,
+                 spill_dir=None):
+        self.rules = CHURN_RULES if rules is None else rules
+        self.tail_size = tail_size
+        self.sketch_k = sketch_k
+        self.rows = 0
+        self.counts = [0] * len(self.rules)
+        self.missing = {}
+        self.dtypes = {}
+        self.moments = {}
+        self.sketches = {}
+        self.row_hashes = HashPartitions(spill_rows, spill_dir=spill_dir)
+        self.unique_hashes = {i: HashPartitions(spill_rows, spill_dir=spill_dir)
+                              for i, r in enumerate(self.rules) if r["type"] == "unique"}
+        self.tails = {i: np.empty(0) for i, r in enumerate(self.rules) if r["type"] == "quantile"}
+        self.tail_sketches = {i: KLLSketch(sketch_k) for i in self.tails}
+        # First/last value per monotonic rule, so chunk boundaries can be checked on merge
+        self.edges = {i: None for i, r in enumerate(self.rules) if r["type"] == "monotonic"}
+        # (packed mask, rows) per chunk for each row-level rule
+        self.masks = {} if keep_masks else None
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        for col, n_missing in chunk.isnull().sum().items():
+            self.missing[col] = self.missing.get(col, 0) + int(n_missing)
+        for col, dtype in chunk.dtypes.items():
+            self.dtypes.setdefault(col, str(dtype))
+        for col in chunk.select_dtypes(include=["number"]).columns:
+            values = _values(chunk[col]).astype("float64", copy=False)
+            self.moments.setdefault(col, Moments()).update(values)
+            self.sketches.setdefault(col, KLLSketch(self.sketch_k)).update(values)
+        self.row_hashes.add(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+
+        for i, rule in enumerate(self.rules):
+            if rule["column"] not in chunk.columns:
+                continue
+            series = chunk[rule["column"]]
+            if rule["type"] == "unique":
+                self.unique_hashes[i].add(pd.util.hash_pandas_object(series, index=False).to_numpy())
+            elif rule["type"] == "quantile":
+                values = _values(series).astype("float64", copy=False)
+                values = values[~np.isnan(values)]
+                self.tail_sketches[i].update(values)
+                self.tails[i] = self._top(np.concatenate([self.tails[i], values]))
+            elif rule["type"] == "monotonic":
+                self._merge_edges(i, series)
+            else:
+                outcome = RULE_EVALUATORS[rule["type"]](series, rule)
+                self.counts[i] += int(np.count_nonzero(outcome))
+                if self.masks is not None and isinstance(outcome, np.ndarray):
+                    self.masks.setdefault(i, []).append((np.packbits(outcome), len(outcome)))
+        return self
+
+    def row_masks(self) -> dict:
+        """Full-length boolean mask per row-level rule index (requires keep_masks)."""
+        return {i: np.concatenate([np.unpackbits(packed, count=n).astype(bool) for packed, n in parts])
+                for i, parts in self.masks.items()}
+
+    def _top(self, values):
+        if len(values) > self.tail_size:
+            values = np.partition(values, len(values) - self.tail_size)[-self.tail_size:]
+        return values
+
+    def _merge_edges(self, i, series):
+        if not len(series):
+            return
+        if series.isna().any() or not series.is_monotonic_increasing:
+            self.counts[i] = 1
+        self._join_edges(i, (series.iloc[0], series.iloc[-1]))
+
+    def _join_edges(self, i, edges):
+        if edges is None:
+            return
+        if self.edges[i] is not None and self.edges[i][1] > edges[0]:
+            self.counts[i] = 1
+        first = edges[0] if self.edges[i] is None else self.edges[i][0]
+        self.edges[i] = (first, edges[1])
+
+    def merge(self, other):
+        """Fold in the state of the chunks that follow this one."""
+        self.rows += other.rows
+        self.counts = [a + b if r["type"] != "monotonic" else max(a, b)
+                       for r, a, b in zip(self.rules, self.counts, other.counts)]
+        for col, n_missing in other.missing.items():
+            self.missing[col] = self.missing.get(col, 0) + n_missing
+        for col, dtype in other.dtypes.items():
+            self.dtypes.setdefault(col, dtype)
+        for col, moments in other.moments.items():
+            self.moments.setdefault(col, Moments()).merge(moments)
+        for col, sketch in other.sketches.items():
+            self.sketches.setdefault(col, KLLSketch(self.sketch_k)).merge(sketch)
+        self.row_hashes.merge(other.row_hashes)
+        for i, hashes in other.unique_hashes.items():
+            self.unique_hashes[i].merge(hashes)
+        for i, tail in other.tails.items():
+            self.tails[i] = self._top(np.concatenate([self.tails[i], tail]))
+            self.tail_sketches[i].merge(other.tail_sketches[i])
+        for i, edges in other.edges.items():
+            self._join_edges(i, edges)
+        if self.masks is not None and other.masks is not None:
+            for i, parts in other.masks.items():
+                self.masks.setdefault(i, []).extend(parts)
+        return self
+
+    def _quantile_count(self, i):
+        """
+        Values above the q-quantile. Exact while the retained top tail reaches the
+        interpolation points (up to about tail_size / (1 - q) rows); sketch-based beyond that.
+        """
+        q, tail, n = self.rules[i]["q"], np.sort(self.tails[i]), self.tail_sketches[i].n
+        count = _tail_quantile_count(tail, n, q)
+        if count is not None:
+            return count
+        threshold = self.tail_sketches[i].quantile(q)
+        if len(tail) == 0 or threshold < tail[0]:
+            return int(round(n * (1 - q)))
+        return int(np.count_nonzero(tail > threshold))
+
+    def close(self):
+        """Remove the spilled hash files."""
+        self.row_hashes.close()
+        for hashes in self.unique_hashes.values():
+            hashes.close()
+
+    def finalize(self):
+        """Rule counts and the report dict in the same shape validate_churn_data produces."""
+        rule_counts = []
+        for i, rule in enumerate(self.rules):
+            if rule["column"] not in self.dtypes:
+                logging.warning(f"Skipping rules for missing column {rule['column']}")
+                continue
+            if rule["type"] == "unique":
+                count = self.unique_hashes[i].duplicates()
+            elif rule["type"] == "quantile":
+                count = self._quantile_count(i)
+            else:
+                count = self.counts[i]
+            rule_counts.append((rule, count))
+
+        numeric_summary = {}
+        for col, moments in self.moments.items():
+            sketch = self.sketches[col]
+            numeric_summary[col] = {
+                "count": float(moments.n),
+                "mean": moments.mean if moments.n else np.nan,
+                "std": moments.std(),
+                "min": moments.min if moments.n else np.nan,
+                "25%": sketch.quantile(0.25),
+                "50%": sketch.quantile(0.50),
+                "75%": sketch.quantile(0.75),
+                "max": moments.max if moments.n else np.nan,
+            }
+        report = {
+            "missing_values": self.missing,
+            "duplicate_rows": self.row_hashes.duplicates(),
+            "data_types": self.dtypes,
+            "numeric_summary": numeric_summary,
+        }
+        return rule_counts, report
+
+def validate_churn_data_chunked(chunks, output_dir="reports", fmt="csv", rules=None, tail_size=100_000,
+                                report_mode="inline", spill_dir=None):
+    """
+    Validate a dataset given as an iterator of DataFrames (e.g. load_csv_chunks) without
+    holding it in memory. Produces the same issues/report structure as validate_churn_data;
+    quartiles in the numeric summary come from KLL sketches and are approximate.
+    Duplicate checks spill their hashes under `spill_dir` (default: the system temp dir).
+    """
+    logging.info("===== Chunked validation started =====")
+    state = ChunkedValidationState(rules, tail_size=tail_size, spill_dir=spill_dir)
+    try:
+        for chunk in chunks:
+            state.update(chunk)
+        logging.info(f"Validated {state.rows} rows in chunks")
+        rule_counts, report = state.finalize()
+    finally:
+        state.close()
+    issues_df = _issues_from_counts(rule_counts)
+    run_report(report_mode, save_validation_reports, issues_df, report, output_dir)
+    logging.info("===== Chunked validation completed =====")
+
+    return issues_df, report
+
+
+# ---------------------
+# Distribution profiles and drift
+# ---------------------
+def build_profile(df: pd.DataFrame, bins=50, max_categories=100, sketch_k=1024) -> dict:
+    """
+    Compact per-column profile: exact value counts for discrete numeric columns (integral
+    values spanning fewer than `max_categories` steps), a fixed-bin histogram for other numeric
+    columns, and value frequencies for low-cardinality categorical columns. Every numeric
+    column also gets a KLL quantile sketch (`sketch_*` arrays, see KLLSketch.to_arrays).
+    """
+    profile = {"n_rows": len(df), "numeric": {}, "categorical": {}}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = _values(series).astype("float64", copy=False)
+            values = values[~np.isnan(values)]
+            if not len(values):
+                continue
+            lo, hi = values.min(), values.max()
+            if hi - lo < max_categories and (pd.api.types.is_integer_dtype(series) or np.all(values == np.floor(values))):
+                counts = np.bincount((values - lo).astype(np.int64))
+                present = np.flatnonzero(counts)
+                profile["numeric"][col] = {"values": present + lo, "counts": counts[present]}
+            else:
+                counts, edges = np.histogram(values, bins=bins, range=(lo, hi))
+                profile["numeric"][col] = {"edges": edges, "counts": counts}
+            sketch = KLLSketch(sketch_k)
+            sketch.update(values)
+            profile["numeric"][col].update({f"sketch_{name}": array for name, array in sketch.to_arrays().items()})
+        else:
+            freq = series.value_counts(dropna=False)
+            if len(freq) <= max_categories:
+                profile["categorical"][col] = {"values": freq.index.astype(str).to_numpy(dtype=str),
+                                               "counts": freq.to_numpy()}
+    return profile
+
+def write_profile(df: pd.DataFrame, output_dir="reports"):
+    """
+    Build the distribution profile of `df` (a frame, or the Arrow IPC / Parquet file the
+    workers read) and save it next to the reports; returns its path.
+    """
+    if isinstance(df, str):
+        df = (pq.read_table(df) if df.endswith(".parquet") else _read_ipc(df)).to_pandas()
+    os.makedirs(output_dir, exist_ok=True)
+    profile_file = os.path.join(output_dir, f"churn_data_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npz")
+    save_profile(build_profile(df), profile_file)
+    logging.info(f"Distribution profile saved at {profile_file}")
+    return profile_file
+
+def save_profile(profile: dict, path: str):
+    arrays = {"n_rows": np.array(profile["n_rows"])}
+    for kind in ("numeric", "categorical"):
+        for col, parts in profile[kind].items():
+            for name, array in parts.items():
+                arrays[f"{kind}/{col}/{name}"] = array
+    np.savez_compressed(path, **arrays)
+    return path
+
+def load_profile(path: str) -> dict:
+    profile = {"numeric": {}, "categorical": {}}
+    with np.load(path) as data:
+        profile["n_rows"] = int(data["n_rows"])
+        for key in data.files:
+            if key == "n_rows":
+                continue
+            kind, col, name = key.split("/", 2)
+            profile[kind].setdefault(col, {})[name] = data[key]
+    return profile
+
+def _profile_cdf(parts, points):
+    """
+    CDF of a profiled numeric column at `points`: a step function over the values of a
+    discrete column, piecewise-linear over the bins of a histogram.
+    """
+    cumulative = np.concatenate([[0.0], np.cumsum(parts["counts"])]) / max(parts["counts"].sum(), 1)
+    if "values" in parts:
+        return cumulative[np.searchsorted(parts["values"], points, side="right")]
+    return np.interp(points, parts["edges"], cumulative, left=0.0, right=1.0)
+
+def _profile_sketch(parts):
+    """The column's KLLSketch, or None for profiles saved without one."""
+    if "sketch_items" not in parts:
+        return None
+    return KLLSketch.from_arrays(parts["sketch_items"], parts["sketch_levels"], parts["sketch_stats"])
+
+def _sketch_ks(base: KLLSketch, cur: KLLSketch):
+    """
+    Two-sample KS statistic between the CDFs of two sketches, evaluated at every retained item,
+    and the same statistic less three standard deviations of the sketches' combined rank error,
+    so sketch noise alone does not read as drift.
+    """
+    grid = np.union1d(np.concatenate(base.levels), np.concatenate(cur.levels))
+    ks = float(np.max(np.abs(base.rank(grid) / base.n - cur.rank(grid) / cur.n)))
+    slack = 3 * (base.rank_error() / base.n + cur.rank_error() / cur.n)
+    return ks, max(ks - slack, 0.0)
+
+def _profile_bins(parts):
+    """PSI bin edges of a profiled column; the outer bins are open so no mass falls outside."""
+    if "values" in parts:
+        values = parts["values"].astype("float64")
+        inner = (values[1:] + values[:-1]) / 2
+    else:
+        inner = parts["edges"][1:-1].astype("float64")
+    return np.concatenate([[-np.inf], inner, [np.inf]])
+
+def _smoothed(counts, alpha=0.5):
+    """Additive (Jeffreys) smoothing, so bins empty on one side get a floor scaled to the sample size."""
+    return (counts + alpha) / (counts.sum() + alpha * len(counts))
+
+def _psi(expected_counts, actual_counts, alpha=0.5):
+    expected, actual = _smoothed(expected_counts, alpha), _smoothed(actual_counts, alpha)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+def compare_profiles(current: dict, baseline: dict, psi_threshold=0.2, p_threshold=0.01) -> pd.DataFrame:
+    """
+    Drift of `current` against `baseline` without touching raw data. Numeric columns: PSI over
+    the baseline's bins (its values for discrete columns) and the two-sample KS statistic, with
+    the asymptotic Kolmogorov p-value (conservative for discrete columns). KS uses the exact
+    counts of discrete columns and the quantile sketches of the others; the p-value of a
+    sketched column is taken after allowing for the sketch error (see _sketch_ks).
+    Categorical columns: chi-square test of homogeneity on the aligned counts, so a category
+    seen on one side only is judged against the pooled frequency. PSI uses smoothed proportions.
+    """
+    rows = []
+    for col, base in baseline["numeric"].items():
+        if col not in current["numeric"]:
+            continue
+        cur = current["numeric"][col]
+        n, m = float(base["counts"].sum()), float(cur["counts"].sum())
+        edges = _profile_bins(base)
+        psi = _psi(np.diff(_profile_cdf(base, edges)) * n, np.diff(_profile_cdf(cur, edges)) * m)
+        base_sketch, cur_sketch = _profile_sketch(base), _profile_sketch(cur)
+        if "values" in base and "values" in cur or base_sketch is None or cur_sketch is None:
+            grid = np.union1d(base.get("values", base.get("edges")), cur.get("values", cur.get("edges")))
+            ks = ks_tested = float(np.max(np.abs(_profile_cdf(base, grid) - _profile_cdf(cur, grid))))
+        else:
+            ks, ks_tested = _sketch_ks(base_sketch, cur_sketch)
+        ks_p = float(stats.kstwobign.sf(ks_tested * np.sqrt(n * m / (n + m)))) if n and m else np.nan
+        rows.append({"column": col, "kind": "numeric", "psi": psi, "ks": ks, "chi2": np.nan, "p_value": ks_p,
+                     "drift": psi > psi_threshold or ks_p < p_threshold})
+    for col, base in baseline["categorical"].items():
+        if col not in current["categorical"]:
+            continue
+        cur = current["categorical"][col]
+        values = np.union1d(base["values"], cur["values"])
+        table = np.zeros((2, len(values)))
+        table[0, np.searchsorted(values, base["values"])] = base["counts"]
+        table[1, np.searchsorted(values, cur["values"])] = cur["counts"]
+        if len(values) > 1 and table.sum(axis=1).all():
+            chi2, p_value = stats.chi2_contingency(table, correction=False)[:2]
+        else:
+            chi2, p_value = 0.0, 1.0
+        psi = _psi(table[0], table[1])
+        rows.append({"column": col, "kind": "categorical", "psi": psi, "ks": np.nan, "chi2": float(chi2),
+                     "p_value": float(p_value), "drift": psi > psi_threshold or p_value < p_threshold})
+    return pd.DataFrame(rows, columns=["column", "kind", "psi", "ks", "chi2", "p_value", "drift"])
+
+def check_drift(current, baseline, **kwargs) -> pd.DataFrame:
+    """compare_profiles accepting profile dicts or paths of saved profiles."""
+    current = load_profile(current) if isinstance(current, str) else current
+    baseline = load_profile(baseline) if isinstance(baseline, str) else baseline
+    drift_df = compare_profiles(current, baseline, **kwargs)
+    drifted = drift_df.loc[drift_df["drift"], "column"].tolist()
+    if drifted:
+        logging.warning(f"Distribution drift detected in: {drifted}")
+    return drift_df
+
+# ---------------------
+# Multi-core validation
+# ---------------------
+def _exact_tail_size(n_rows, rules):
+    """Tail length that keeps every quantile rule exact for `n_rows` rows."""
+    qs = [r["q"] for r in rules if r["type"] == "quantile"]
+    return max(1, int(np.ceil(n_rows * (1 - min(qs)))) + 2) if qs else 1
+
+def _validate_shard(path, shard, rules, tail_size, keep_masks=False):
+    """
+    Worker: validate one shard of an Arrow IPC or Parquet file. IPC files are memory-mapped,
+    so every worker reads the same pages from the OS cache instead of receiving a pickled frame.
+    `shard` is (start, stop) rows for IPC and a list of row groups for Parquet.
+    """
+    if path.endswith(".parquet"):
+        table = pq.ParquetFile(path, memory_map=True).read_row_groups(shard)
+    else:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all().slice(shard[0], shard[1] - shard[0])
+    return ChunkedValidationState(rules, tail_size=tail_size, keep_masks=keep_masks).update(table.to_pandas())
+
+def _plan_shards(path, workers):
+    if path.endswith(".parquet"):
+        metadata = pq.ParquetFile(path).metadata
+        groups = list(range(metadata.num_row_groups))
+        return metadata.num_rows, [list(g) for g in np.array_split(groups, min(workers, len(groups))) if len(g)]
+    with pa.memory_map(path, "r") as source:
+        n_rows = pa.ipc.open_file(source).read_all().num_rows
+    bounds = np.linspace(0, n_rows, workers + 1, dtype=int)
+    return n_rows, [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+def _read_column(path, column) -> pd.Series:
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=[column]).column(0).to_pandas()
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all().column(column).to_pandas()
+
+def _parallel_index(state, data, path, n_rows, rules):
+    """
+    ViolationIndex from the merged shard masks. Uniqueness and quantile masks depend on the
+    whole column, so those two rule types are evaluated here on their column alone.
+    """
+    masks = state.row_masks()
+    by_column = {}
+    for i, rule in enumerate(rules):
+        by_column.setdefault(rule["column"], []).append(i)
+    results = []
+    for column, indices in by_column.items():
+        if column not in state.dtypes:
+            continue
+        for i in indices:
+            rule = rules[i]
+            if rule["type"] in ("unique", "quantile"):
+                series = data[column] if isinstance(data, pd.DataFrame) else _read_column(path, column)
+                masks[i] = RULE_EVALUATORS[rule["type"]](series, rule)
+            if i in masks:
+                results.append((rule, int(np.count_nonzero(masks[i])), masks[i]))
+    return ViolationIndex.from_results(n_rows, results)
+
+def validate_churn_data_parallel(data, output_dir="reports", fmt="csv", rules=None, workers=4, report_mode="inline",
+                                 return_index=False):
+    """
+    Validate across `workers` processes. `data` is a DataFrame (staged once as an uncompressed
+    Arrow IPC file that workers memory-map) or a path to an Arrow IPC/Feather or Parquet file.
+    Shard states are merged in row order, so every count-based rule matches the serial result;
+    numeric-summary quartiles come from merged KLL sketches.
+    With `return_index` the shards also send back their packed rule masks and a ViolationIndex
+    is returned as a third value.
+    """
+    rules = CHURN_RULES if rules is None else rules
+    logging.info(f"===== Parallel validation started ({workers} workers) =====")
+    staging_dir, state = None, None
+    try:
+        if isinstance(data, pd.DataFrame):
+            staging_dir = tempfile.mkdtemp(prefix="churn_validation_")
+            path = os.path.join(staging_dir, "frame.arrow")
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            del table
+        else:
+            path = data
+        n_rows, shards = _plan_shards(path, workers)
+        tail_size = _exact_tail_size(n_rows, rules)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            states = list(pool.map(_validate_shard, [path] * len(shards), shards, [rules] * len(shards),
+                                   [tail_size] * len(shards), [return_index] * len(shards)))
+
+        state = ChunkedValidationState(rules, tail_size=tail_size, keep_masks=return_index)
+        for shard_state in states:
+            state.merge(shard_state)
+        del states
+        index = _parallel_index(state, data, path, n_rows, rules) if return_index else None
+        rule_counts, report = state.finalize()
+    finally:
+        if state is not None:
+            state.close()
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    if isinstance(data, pd.DataFrame):
+        report["data_types"] = data.dtypes.apply(lambda x: str(x)).to_dict()
+
+    issues_df = _issues_from_counts(rule_counts)
+    run_report(report_mode, save_validation_reports, issues_df, report, output_dir)
+    logging.info("===== Parallel validation completed =====")
+
+    if return_index:
+        return issues_df, report, index
     return issues_df, report
 
+# ---------------------
+# Incremental validation
+# ---------------------
+DATASET_RULE_TYPES = ("unique", "quantile", "monotonic")
+
+def _bit_counts(bits: np.ndarray, n_bits: int):
+    """Number of rows with each bit set in a uint64 per-row bitmask."""
+    return [int(np.count_nonzero((bits >> np.uint64(j)) & np.uint64(1))) for j in range(n_bits)]
+
+def _row_bits(rows: pd.DataFrame, row_rules, n_columns):
+    """Per-row rule-violation and missing-value bitmasks (uint64) of `rows`."""
+    violations = np.zeros(len(rows), dtype=np.uint64)
+    for j, (_, rule) in enumerate(row_rules):
+        mask = RULE_EVALUATORS[rule["type"]](rows[rule["column"]], rule)
+        violations |= mask.astype(np.uint64) << np.uint64(j)
+    weights = np.left_shift(np.uint64(1), np.arange(n_columns, dtype=np.uint64))
+    missing = (rows.isnull().to_numpy().astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+    return violations, missing
+
+def _changed_rows(current, previous) -> np.ndarray:
+    """Row mask where two aligned column arrays differ; missing values compare equal."""
+    try:
+        differs = current != previous
+    except TypeError:
+        # e.g. categoricals whose categories differ
+        differs = np.asarray(current, dtype=object) != np.asarray(previous, dtype=object)
+    if not isinstance(differs, np.ndarray):
+        differs = differs.to_numpy(dtype=bool, na_value=True)
+    return differs & ~(pd.isna(current) & pd.isna(previous))
+
+def _changed_frame(current: pd.DataFrame, previous, columns) -> np.ndarray:
+    """Rows of `current` that differ from the aligned rows of `previous` (a DataFrame or Arrow table)."""
+    changed = np.zeros(len(current), dtype=bool)
+    for col in columns:
+        # Column by column, so stored Arrow columns convert without consolidating a frame
+        stored = previous.column(col).to_pandas() if isinstance(previous, pa.Table) else previous[col]
+        changed |= _changed_rows(current[col].array, stored.array)
+    return changed
+
+def _float_values(series: pd.Series) -> np.ndarray:
+    values = _values(series).astype("float64", copy=False)
+    return values[~np.isnan(values)]
+
+def _top_values(values, size):
+    """Sorted `size` largest values."""
+    if len(values) > size:
+        values = np.partition(values, len(values) - size)[-size:]
+    return np.sort(values)
+
+def _tail_size(n, q):
+    return 2 * (int(np.ceil(n * (1 - q))) + 2) + 1024
+
+def _tail_remove(tail, values):
+    """Drop one occurrence of each value from a sorted top tail; smaller values are not in it."""
+    values = np.sort(values[values >= tail[0]]) if len(tail) else values[:0]
+    if not len(values):
+        return tail
+    positions = np.searchsorted(tail, values, side="left") + np.arange(len(values)) - np.searchsorted(values, values, side="left")
+    valid = positions < len(tail)
+    positions = positions[valid]
+    return np.delete(tail, positions[tail[positions] == values[valid]])
+
+def _tail_add(tail, values, complete, size):
+    """
+    Add values to a sorted top tail. Unless the tail holds every value (`complete`), only values
+    reaching into it can join: anything smaller may rank below values that were never kept.
+    """
+    if not complete:
+        if not len(tail):
+            return tail
+        values = values[values >= tail[0]]
+    tail = np.sort(np.concatenate([tail, values]))
+    return tail[-size:]
+
+def _read_ipc(path) -> pa.Table:
+    # Buffers keep the memory map open for as long as the table is referenced
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+def _write_ipc(table: pa.Table, path):
+    with pa.OSFile(f"{path}.tmp", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(f"{path}.tmp", path)
+
+class IncrementalValidationState:
+    """
+    Delta-maintained state of validate_churn_data_incremental, persisted under state_dir:
+
+    - the rows seen by the last run with their rule-violation and missing-value bitmasks: an
+      Arrow IPC base file (memory-mapped, only rewritten on compaction) plus a small delta file
+      of rows changed since, i.e. new versions and tombstones, each naming the base row it
+      supersedes (__base__);
+    - per-rule violation counts and per-column missing counts;
+    - per numeric column, Moments and two KLL sketches (values added / values retracted);
+    - the sorted top tail of each quantile rule's column.
+
+    Only rows whose key is unique within the frame are tracked ("keyed" rows); rows sharing a
+    key are validated from scratch on every run.
+    """
+
+    META_FILE = "validation_state.json"
+
+    def __init__(self, signature, sketch_k=256):
+        self.signature = signature
+        self.sketch_k = sketch_k
+        self.generation = 0
+        self.base_file = None
+        self.base = None
+        self.delta = None
+        self.counts = [0] * len(signature["row_rules"])
+        self.missing = [0] * len(signature["columns"])
+        self.moments = {}
+        self.added = {}
+        self.removed = {}
+        self.tails = {}
+
+    @classmethod
+    def load(cls, state_dir, signature):
+        meta_file = os.path.join(state_dir, cls.META_FILE)
+        if not os.path.exists(meta_file):
+            return None
+        with open(meta_file, "r") as f:
+            meta = json.load(f)
+        if meta.get("signature") != signature:
+            logging.info("Incremental validation state was built for other rules or columns; rebuilding")
+            return None
+        state = cls(signature, meta["sketch_k"])
+        state.generation, state.base_file = meta["generation"], meta["base_file"]
+        state.counts, state.missing = meta["counts"], meta["missing"]
+        state.base = _read_ipc(os.path.join(state_dir, meta["base_file"]))
+        if meta["delta_file"]:
+            state.delta = _read_ipc(os.path.join(state_dir, meta["delta_file"])).to_pandas()
+        with np.load(os.path.join(state_dir, meta["arrays_file"])) as data:
+            items, start = data["sketch_items"], 0
+            for col, (n, mean, m2, lo, hi) in meta["moments"].items():
+                state.moments[col] = Moments()
+                state.moments[col].n, state.moments[col].mean, state.moments[col].m2 = n, mean, m2
+                state.moments[col].min, state.moments[col].max = lo, hi
+                for kind in ("added", "removed"):
+                    n_items, sizes, variance = meta["sketches"][kind][col]
+                    sketch = KLLSketch(state.sketch_k)
+                    sketch.n, sketch.variance, sketch.levels = n_items, variance, []
+                    for size in sizes:
+                        sketch.levels.append(items[start:start + size])
+                        start += size
+                    getattr(state, kind)[col] = sketch
+            for i in meta["tails"]:
+                state.tails[int(i)] = data[f"tail/{i}"]
+        return state
+
+    def save(self, state_dir, base_table=None, delta=None):
+        """Write a new generation of state files, switch the metadata to it, then drop the old files."""
+        os.makedirs(state_dir, exist_ok=True)
+        self.generation += 1
+        if base_table is not None:
+            self.base_file = f"validation_rows_{self.generation}.arrow"
+            _write_ipc(base_table, os.path.join(state_dir, self.base_file))
+            self.base = base_table
+        delta_file = None
+        if delta is not None and len(delta):
+            delta_file = f"validation_delta_{self.generation}.arrow"
+            schema = self.base.schema.remove_metadata().append(pa.field("__base__", pa.int64())).append(
+                pa.field("__deleted__", pa.bool_()))
+            _write_ipc(pa.Table.from_pandas(delta, schema=schema, preserve_index=False),
+                       os.path.join(state_dir, delta_file))
+        self.delta = delta if delta_file else None
+
+        arrays_file = f"validation_arrays_{self.generation}.npz"
+        # Sketch levels are stored back to back in one array, in moments-column order
+        items, sketches = [], {"added": {}, "removed": {}}
+        for col in self.moments:
+            for kind in ("added", "removed"):
+                sketch = getattr(self, kind)[col]
+                sketches[kind][col] = [sketch.n, [len(level) for level in sketch.levels], sketch.variance]
+                items.extend(sketch.levels)
+        arrays = {"sketch_items": np.concatenate(items) if items else np.empty(0)}
+        for i, tail in self.tails.items():
+            arrays[f"tail/{i}"] = tail
+        np.savez(os.path.join(state_dir, arrays_file), **arrays)
+
+        meta = {"signature": self.signature, "sketch_k": self.sketch_k, "generation": self.generation,
+                "base_file": self.base_file, "delta_file": delta_file, "arrays_file": arrays_file,
+                "counts": self.counts, "missing": self.missing,
+                "moments": {col: [m.n, m.mean, m.m2, m.min, m.max] for col, m in self.moments.items()},
+                "sketches": sketches, "tails": [str(i) for i in self.tails],
+                "updated_at": datetime.now().isoformat()}
+        meta_file = os.path.join(state_dir, self.META_FILE)
+        with open(f"{meta_file}.tmp", "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(f"{meta_file}.tmp", meta_file)
+
+        keep = {self.META_FILE, self.base_file, delta_file, arrays_file}
+        for name in os.listdir(state_dir):
+            if name.startswith("validation_") and name not in keep:
+                os.remove(os.path.join(state_dir, name))
+
+    def apply(self, old: pd.DataFrame, new: pd.DataFrame, new_bits, rules, keyed_values):
+        """
+        Retract the stored rows in `old` and add the rows in `new` (with their bitmasks).
+        keyed_values(col) returns the column over all keyed rows, for the rare recomputations:
+        a retracted min/max, a sketch that has retracted more than half its mass, a tail that
+        became too short.
+        """
+        n_rules, n_columns = len(self.signature["row_rules"]), len(self.signature["columns"])
+        old_bits = (old["__violations__"].to_numpy(dtype=np.uint64), old["__missing__"].to_numpy(dtype=np.uint64))
+        for sign, (violations, missing) in ((1, new_bits), (-1, old_bits)):
+            self.counts = [c + sign * d for c, d in zip(self.counts, _bit_counts(violations, n_rules))]
+            self.missing = [c + sign * d for c, d in zip(self.missing, _bit_counts(missing, n_columns))]
+
+        quantile_rules = [(i, r) for i, r in enumerate(rules) if r["type"] == "quantile" and r["column"] in self.signature["numeric"]]
+        complete = {i: len(self.tails.get(i, ())) == self.moments.get(r["column"], Moments()).n for i, r in quantile_rules}
+        for col in self.signature["numeric"]:
+            added, removed = _float_values(new[col]), _float_values(old[col])
+            moments = self.moments.setdefault(col, Moments())
+            lo, hi = moments.min, moments.max
+            moments.remove(removed)
+            moments.update(added)
+            # An extreme that was retracted survives only if an added value matches it
+            lost_min = len(removed) and removed.min() <= lo and not (len(added) and added.min() <= lo)
+            lost_max = len(removed) and removed.max() >= hi and not (len(added) and added.max() >= hi)
+            if (lost_min or lost_max) and moments.n:
+                values = keyed_values(col)
+                moments.min, moments.max = float(values.min()), float(values.max())
+            self.added.setdefault(col, KLLSketch(self.sketch_k)).update(added)
+            self.removed.setdefault(col, KLLSketch(self.sketch_k)).update(removed)
+            if self.removed[col].n > self.added[col].n / 2:
+                self.added[col] = KLLSketch(self.sketch_k)
+                self.added[col].update(keyed_values(col))
+                self.removed[col] = KLLSketch(self.sketch_k)
+        for i, rule in quantile_rules:
+            col = rule["column"]
+            size = _tail_size(self.moments[col].n, rule["q"])
+            tail = _tail_remove(self.tails.get(i, np.empty(0)), _float_values(old[col]))
+            self.tails[i] = _tail_add(tail, _float_values(new[col]), complete[i], size)
+
+    def quantile_count(self, i, rule, extra: pd.DataFrame, keyed_values):
+        """Quantile-rule count over the keyed rows plus the untracked `extra` rows."""
+        col, q = rule["column"], rule["q"]
+        extra_values = _float_values(extra[col])
+        n_keyed = self.moments[col].n if col in self.moments else 0
+        for attempt in range(2):
+            tail = self.tails.get(i, np.empty(0))
+            top = np.sort(np.concatenate([tail, extra_values]))
+            if len(tail) < n_keyed:
+                # Keyed values below the tail are unknown, so only the part above it is a true top
+                top = top[np.searchsorted(top, tail[0] if len(tail) else np.inf, side="left"):]
+            count = _tail_quantile_count(top, n_keyed + len(extra_values), q)
+            if count is not None:
+                return count
+            self.tails[i] = _top_values(keyed_values(col), _tail_size(n_keyed + len(extra_values), q))
+        return count
+
+def validate_churn_data_incremental(df: pd.DataFrame, output_dir="reports", fmt="csv", rules=None,
+                                    state_dir=None, key="CustomerId", report_mode="inline",
+                                    compact_fraction=0.1, sketch_k=256):
+    """
+    Validate a new snapshot by applying only its delta (rows inserted, updated or deleted,
+    matched on `key`) to the state kept by the previous run (IncrementalValidationState in
+    state_dir, default <output_dir>/validation_state). Changed rows are found by comparing the
+    snapshot column by column with the memory-mapped stored rows, so nothing is hashed or
+    re-sorted; row rules, missing counts, moments, sketches and quantile tails are updated from
+    the changed rows only. Uniqueness and duplicate rows follow from the key matching, and the
+    sequence check is column-only.
+    Issues, missing values and duplicate rows match validate_churn_data; numeric-summary
+    quartiles come from KLL sketches and are approximate. The stored rows are rewritten once
+    the delta exceeds `compact_fraction` of them.
+    """
+    rules = CHURN_RULES if rules is None else rules
+    state_dir = state_dir or os.path.join(output_dir, "validation_state")
+    logging.info("===== Incremental validation started =====")
+
+    df = df.rename(columns=str)
+    key = str(key)
+    if key not in df.columns:
+        raise ValueError(f"Key column {key} not in the frame")
+    row_rules = [(i, r) for i, r in enumerate(rules) if r["type"] not in DATASET_RULE_TYPES and r["column"] in df.columns]
+    columns = list(df.columns)
+    if len(row_rules) > 64 or len(columns) > 64:
+        raise ValueError("Incremental validation supports at most 64 row-level rules and 64 columns")
+    signature = json.loads(json.dumps({
+        "key": key, "rules": rules, "row_rules": [i for i, _ in row_rules], "columns": columns,
+        "numeric": list(df.select_dtypes(include=["number"]).columns),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }))
+    state = IncrementalValidationState.load(state_dir, signature) or IncrementalValidationState(signature, sketch_k)
+    base, delta = state.base, state.delta
+    n_rows = len(df)
+    n_base = base.num_rows if base is not None else 0
+    n_delta = len(delta) if delta is not None else 0
+
+    # --- Match rows to their stored version by key ---
+    keys = pd.Index(df[key])
+    base_live = np.ones(n_base, dtype=bool)
+    delta_live = np.zeros(n_delta, dtype=bool)
+    if n_delta:
+        superseded = delta["__base__"].to_numpy()
+        base_live[superseded[superseded >= 0]] = False
+        delta_live = ~delta["__deleted__"].to_numpy(dtype=bool)
+    base_keys = pd.Index(base.column(key).to_pandas()) if n_base else pd.Index([])
+    aligned = n_base > 0 and n_base == n_rows and keys.equals(base_keys)
+    if aligned:
+        pos = np.arange(n_rows)
+    else:
+        pos = base_keys.get_indexer(keys) if n_base else np.full(n_rows, -1)
+    in_base = pos >= 0
+    in_base[in_base] = base_live[pos[in_base]]
+    rest = np.flatnonzero(~in_base)
+    dpos = np.full(n_rows, -1)
+    if len(rest) and delta_live.any():
+        live_rows = np.flatnonzero(delta_live)
+        found = pd.Index(delta[key].to_numpy()[live_rows]).get_indexer(keys[rest])
+        dpos[rest[found >= 0]] = live_rows[found[found >= 0]]
+    in_delta = dpos >= 0
+
+    # Stored keys are unique, so an aligned frame has no repeated keys
+    keyed = np.ones(n_rows, dtype=bool)
+    if not aligned:
+        hits = np.bincount(pos[in_base], minlength=n_base)
+        keyed[in_base] = hits[pos[in_base]] < 2
+        keyed[rest] = ~keys[rest].duplicated(keep=False)
+
+    # --- Compare matched rows with their stored version ---
+    changed = keyed & ~in_base & ~in_delta
+    match_base = keyed & in_base
+    if aligned:
+        changed |= match_base & _changed_frame(df, base, columns)
+    elif match_base.any():
+        # Gather the stored rows into current row order instead of gathering the frame
+        changed |= match_base & _changed_frame(df, base.select(columns).take(np.where(match_base, pos, 0)), columns)
+    match_delta = keyed & in_delta
+    if match_delta.any():
+        rows = np.flatnonzero(match_delta)
+        changed[rows] |= _changed_frame(df.iloc[rows], delta.iloc[dpos[rows]], columns)
+
+    # --- Apply the delta: retract the stored versions that are gone, add the new ones ---
+    kept_base, kept_delta = np.flatnonzero(match_base & ~changed), np.flatnonzero(match_delta & ~changed)
+    removed_base = base_live.copy()
+    removed_base[pos[kept_base]] = False
+    removed_base = np.flatnonzero(removed_base)
+    removed_delta = delta_live.copy()
+    removed_delta[dpos[kept_delta]] = False
+    removed_delta = np.flatnonzero(removed_delta)
+    added = np.flatnonzero(keyed & changed)
+    logging.info(f"Applying {len(added)} new row versions and {len(removed_base) + len(removed_delta)} "
+                 f"retractions to {n_base + n_delta} stored rows ({int(np.count_nonzero(~keyed))} rows with repeated keys)")
+
+    old_parts = [delta.iloc[removed_delta]] if len(removed_delta) else []
+    if len(removed_base):
+        old_parts.insert(0, base.take(removed_base).to_pandas())
+    old = pd.concat(old_parts, ignore_index=True) if old_parts else \
+        df.iloc[:0].assign(__violations__=np.empty(0, np.uint64), __missing__=np.empty(0, np.uint64))
+    new = df.iloc[added]
+    new_bits = _row_bits(new, row_rules, len(columns))
+
+    def keyed_values(col):
+        values = _values(df[col]).astype("float64", copy=False)
+        values = values if keyed.all() else values[keyed]
+        return values[~np.isnan(values)]
+
+    state.apply(old, new, new_bits, rules, keyed_values)
+
+    # --- Rule counts and report: tracked state plus the rows with repeated keys ---
+    extra = df[~keyed]
+    extra_bits = _row_bits(extra, row_rules, len(columns))
+    row_counts = {i: c + e for (i, _), c, e in zip(row_rules, state.counts, _bit_counts(extra_bits[0], len(row_rules)))}
+    rule_counts = []
+    for i, rule in enumerate(rules):
+        if rule["column"] not in df.columns:
+            logging.warning(f"Skipping rules for missing column {rule['column']}")
+            continue
+        if i in row_counts:
+            count = row_counts[i]
+        elif rule["type"] == "unique" and rule["column"] == key:
+            count = len(extra) - extra[key].nunique(dropna=False)
+        elif rule["type"] == "quantile" and rule["column"] in signature["numeric"]:
+            count = state.quantile_count(i, rule, extra, keyed_values)
+        else:
+            outcome = RULE_EVALUATORS[rule["type"]](df[rule["column"]], rule)
+            count = int(np.count_nonzero(outcome)) if isinstance(outcome, np.ndarray) else int(outcome)
+        rule_counts.append((rule, count))
+    issues_df = _issues_from_counts(rule_counts)
+
+    numeric_summary = {}
+    for col in signature["numeric"]:
+        extra_values = _float_values(extra[col])
+        moments = Moments().merge(state.moments[col])
+        moments.update(extra_values)
+        sketch = state.added[col]
+        if len(extra_values):
+            sketch = KLLSketch(sketch_k).merge(sketch)
+            sketch.update(extra_values)
+        numeric_summary[col] = {
+            "count": float(moments.n),
+            "mean": moments.mean if moments.n else np.nan,
+            "std": moments.std(),
+            "min": moments.min if moments.n else np.nan,
+            "25%": sketch.quantile(0.25, removed=state.removed[col]),
+            "50%": sketch.quantile(0.50, removed=state.removed[col]),
+            "75%": sketch.quantile(0.75, removed=state.removed[col]),
+            "max": moments.max if moments.n else np.nan,
+        }
+    report = {}
+    report["missing_values"] = dict(zip(columns, (m + e for m, e in zip(state.missing, _bit_counts(extra_bits[1], len(columns))))))
+    # Identical rows share their key, so only rows with repeated keys can be duplicates
+    report["duplicate_rows"] = int(extra.duplicated().sum()) if len(extra) else 0
+    report["data_types"] = df.dtypes.apply(lambda x: str(x)).to_dict()
+    report["numeric_summary"] = numeric_summary
+
+    # --- Persist: new versions and tombstones go to the delta; compact once it grows ---
+    new_versions = np.unique(pos[added][pos[added] >= 0])
+    next_delta = []
+    if n_delta:
+        retired = np.zeros(n_delta, dtype=bool)
+        retired[removed_delta] = True
+        superseded = np.isin(delta["__base__"].to_numpy(), new_versions)
+        # Unchanged versions and tombstones stay; retracted versions of base rows become tombstones
+        keep = ~superseded & (delta_live & ~retired | ~delta_live | retired & (delta["__base__"].to_numpy() >= 0))
+        next_delta.append(delta[keep].assign(__deleted__=~delta_live[keep] | retired[keep]))
+    if len(added):
+        next_delta.append(new.assign(__violations__=new_bits[0], __missing__=new_bits[1],
+                                     __base__=pos[added], __deleted__=False))
+    tombstones = np.setdiff1d(removed_base, new_versions)
+    if len(tombstones):
+        next_delta.append(base.take(tombstones).to_pandas().assign(__base__=tombstones, __deleted__=True))
+    next_delta = pd.concat(next_delta, ignore_index=True) if next_delta else None
+    n_keyed = int(np.count_nonzero(keyed))
+
+    if base is None or (next_delta is not None and len(next_delta) > compact_fraction * max(n_keyed, 1)):
+        violations = np.zeros(n_rows, dtype=np.uint64)
+        missing = np.zeros(n_rows, dtype=np.uint64)
+        if len(kept_base):
+            violations[kept_base] = base.column("__violations__").to_numpy()[pos[kept_base]]
+            missing[kept_base] = base.column("__missing__").to_numpy()[pos[kept_base]]
+        if len(kept_delta):
+            violations[kept_delta] = delta["__violations__"].to_numpy()[dpos[kept_delta]]
+            missing[kept_delta] = delta["__missing__"].to_numpy()[dpos[kept_delta]]
+        violations[added], missing[added] = new_bits
+        table = pa.Table.from_pandas(df if keyed.all() else df[keyed], preserve_index=False)
+        table = table.append_column("__violations__", pa.array(violations[keyed])).append_column(
+            "__missing__", pa.array(missing[keyed]))
+        logging.info(f"Compacting incremental validation state to {n_keyed} rows")
+        state.save(state_dir, base_table=table)
+    else:
+        state.save(state_dir, delta=next_delta)
+
+    run_report(report_mode, save_validation_reports, issues_df, report, output_dir)
+    logging.info("===== Incremental validation completed =====")
+
+    return issues_df, report
+
+def _synthetic_churn(n_rows: int, seed=42) -> pd.DataFrame:
+    """Churn-shaped frame with a sprinkling of invalid values, for benchmarks."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "RowNumber": np.arange(1, n_rows + 1, dtype="int32"),
+        "CustomerId": rng.permutation(n_rows).astype("int32") + 15_000_000,
+        "CreditScore": rng.integers(280, 860, n_rows).astype("int16"),
+        "Geography": pd.Categorical(rng.choice(["France", "Spain", "Germany", "Italy"], n_rows, p=[0.5, 0.25, 0.2499, 0.0001])),
+        "Gender": pd.Categorical(rng.choice(["Male", "Female"], n_rows)),
+        "Age": rng.integers(16, 95, n_rows).astype("int16"),
+        "Tenure": rng.integers(0, 11, n_rows).astype("int8"),
+        "Balance": np.round(rng.uniform(-10, 250_000, n_rows), 2),
+        "NumOfProducts": rng.integers(1, 5, n_rows).astype("int8"),
+        "HasCrCard": rng.integers(0, 2, n_rows).astype("int8"),
+        "IsActiveMember": rng.integers(0, 2, n_rows).astype("int8"),
+        "EstimatedSalary": np.round(rng.uniform(10, 200_000, n_rows), 2),
+        "Exited": rng.integers(0, 2, n_rows).astype("int8"),
+    })
+    return df
+
+def _materializing_check_counts(df: pd.DataFrame):
+    """The previous check sequence (boolean-indexed copies, len(), repeated duplicated()), for comparison."""
+    counts = [int(not df["RowNumber"].is_monotonic_increasing)]
+    if df["CustomerId"].duplicated().any():
+        counts.append(int(df["CustomerId"].duplicated().sum()))
+    counts.append(len(df[(df["CreditScore"] < 300) | (df["CreditScore"] > 850)]))
+    counts.append(len(df[~df["Geography"].isin({"France", "Spain", "Germany"})]))
+    counts.append(len(df[~df["Gender"].isin({"Male", "Female"})]))
+    counts.append(len(df[(df["Age"] < 18) | (df["Age"] > 100)]))
+    counts.append(len(df[(df["Tenure"] < 0) | (df["Tenure"] > 10)]))
+    counts.append(len(df[df["Balance"] < 0]))
+    counts.append(len(df[(df["NumOfProducts"] < 1) | (df["NumOfProducts"] > 4)]))
+    for col in ["HasCrCard", "IsActiveMember", "Exited"]:
+        counts.append(len(df[~df[col].isin([0, 1])]))
+    counts.append(len(df[df["EstimatedSalary"] > df["EstimatedSalary"].quantile(0.999)]))
+    counts.append(int(df.duplicated().sum()))
+    return counts
+
+def benchmark_validation(sizes=(1_000_000, 10_000_000), repeats=3):
+    """
+    Time the previous materializing checks against the single-pass rule engine.
+    Returns one row per size with the best of `repeats` runs.
+    """
+    results = []
+    for n_rows in sizes:
+        df = _synthetic_churn(n_rows)
+        timings = {}
+        for name, run in [("materializing", lambda: _materializing_check_counts(df)),
+                          ("rule_engine", lambda: (evaluate_rules(df), count_duplicate_rows(df)))]:
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        results.append({"rows": n_rows, "materializing_sec": timings["materializing"],
+                        "rule_engine_sec": timings["rule_engine"],
+                        "speedup": timings["materializing"] / timings["rule_engine"]})
+        del df
+    results_df = pd.DataFrame(results)
+    logging.info(f"Validation benchmark:\n{results_df.to_string(index=False)}")
+    return results_df
+
+def benchmark_incremental_validation(n_rows=1_000_000, changed_fraction=0.001, repeats=3):
+    """
+    Time full against incremental validation of snapshots in which `changed_fraction` of the
+    rows changed since the previous run: updated in place ("updates"), or half updated and the
+    rest split between deleted rows and appended new ones ("mixed"). Returns one row per
+    scenario with the best of `repeats` runs and whether both paths reported the same issues.
+    """
+    rng = np.random.default_rng(0)
+    n_changed = max(4, int(n_rows * changed_fraction))
+
+    def next_snapshot(df, scenario):
+        df = df.copy()
+        n_updates = n_changed if scenario == "updates" else n_changed // 2
+        rows = rng.choice(len(df), n_updates, replace=False)
+        df.iloc[rows, df.columns.get_loc("Age")] = rng.integers(16, 95, n_updates).astype("int16")
+        df.iloc[rows, df.columns.get_loc("Balance")] = np.round(rng.uniform(-10, 250_000, n_updates), 2)
+        df.iloc[rows, df.columns.get_loc("EstimatedSalary")] = np.round(rng.uniform(10, 200_050, n_updates), 2)
+        if scenario == "mixed":
+            n_moved = (n_changed - n_updates) // 2
+            df = df.drop(df.index[rng.choice(len(df), n_moved, replace=False)])
+            inserts = _synthetic_churn(n_moved, seed=int(rng.integers(1 << 31)))
+            inserts["RowNumber"] = (df["RowNumber"].max() + 1 + np.arange(n_moved)).astype("int32")
+            inserts["CustomerId"] = (df["CustomerId"].max() + 1 + np.arange(n_moved)).astype("int32")
+            df = pd.concat([df, inserts], ignore_index=True)
+            for col in ("Geography", "Gender"):
+                df[col] = df[col].astype("category")
+        return df
+
+    results = []
+    for scenario in ("updates", "mixed"):
+        state_dir = tempfile.mkdtemp(prefix="churn_incremental_")
+        try:
+            df = _synthetic_churn(n_rows)
+            validate_churn_data_incremental(df, state_dir=state_dir, report_mode="skip")
+            timings, match = {"full": float("inf"), "incremental": float("inf")}, True
+            for _ in range(repeats):
+                df = next_snapshot(df, scenario)
+                start = time.perf_counter()
+                full_issues, _ = validate_churn_data(df, report_mode="skip")
+                timings["full"] = min(timings["full"], time.perf_counter() - start)
+                start = time.perf_counter()
+                incremental_issues, _ = validate_churn_data_incremental(df, state_dir=state_dir, report_mode="skip")
+                timings["incremental"] = min(timings["incremental"], time.perf_counter() - start)
+                match &= full_issues.equals(incremental_issues)
+        finally:
+            shutil.rmtree(state_dir, ignore_errors=True)
+        results.append({"scenario": scenario, "rows": n_rows, "changed_rows": n_changed,
+                        "full_sec": timings["full"], "incremental_sec": timings["incremental"],
+                        "speedup": timings["full"] / timings["incremental"], "issues_match": match})
+    results_df = pd.DataFrame(results)
+    logging.info(f"Incremental validation benchmark:\n{results_df.to_string(index=False)}")
+    return results_df
+
 
 # In[ ]:
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+# report_mode values accepted by the stages that render reports
+REPORT_MODES = ("inline", "background", "skip")
+
+class ReportQueue:
+    """
+    Bounded background queue for report rendering jobs (PDF/CSV writers).
+    Jobs run on a process pool; submit() blocks once `max_pending` jobs are queued so a
+    fast pipeline cannot pile up unbounded report inputs in memory.
+    """
+
+    def __init__(self, max_workers=1, max_pending=4):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        self._slots.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(func, *args, **kwargs)
+            self._pending.append(future)
+        future.add_done_callback(lambda f: self._slots.release())
+        logging.info(f"Report job {func.__name__} queued ({len(self._pending)} pending)")
+        return future
+
+    def wait(self):
+        """Block until every queued job is done; returns their results (None for failed jobs)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        results = []
+        for future in pending:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logging.error(f"Report job failed: {e}")
+                results.append(None)
+        return results
+
+    def shutdown(self):
+        self.wait()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+def get_report_queue() -> ReportQueue:
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = ReportQueue()
+        return _default_queue
+
+def run_report(report_mode: str, func, *args, **kwargs):
+    """Render a report inline, hand it to the background queue, or skip it."""
+    if report_mode not in REPORT_MODES:
+        raise ValueError(f"Unknown report_mode '{report_mode}', expected one of {REPORT_MODES}")
+    if report_mode == "skip":
+        logging.info(f"Report job {func.__name__} skipped")
+        return None
+    if report_mode == "background":
+        return get_report_queue().submit(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+def wait_for_reports():
+    """Collect all background reports; call once at the end of the pipeline."""
+    return get_report_queue().wait()
@@ -0,0 +1,70 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pandas as pd
+import pytest
+
+from dataingestion import DataIngestion
+from dataingestion.DataIngestion import HttpResponseCache, _iter_json_array, commit_fingerprint, load_csv
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    (['[1, 2', '3, 4]'], [1, 23, 4]),
+    (['[1.', '5e', '2, -', '7]'], [150.0, -7]),
+    (['[{"a": 1}', ', 2', ']'], [{"a": 1}, 2]),
+    (['[', '"x"', ', tr', 'ue]'], ["x", True]),
+])
+def test_json_array_elements_split_across_chunks(chunks, expected):
+    assert list(_iter_json_array(chunks)) == expected
+
+
+def test_json_array_truncated_after_element_raises():
+    with pytest.raises(ValueError):
+        list(_iter_json_array(['[1, 2', '3']))
+
+
+@pytest.fixture
+def csv_server():
+    body = b"CustomerId,Geography,Age\n1,France,40\n2,Spain,35\n"
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/churn.csv"
+    server.shutdown()
+
+
+def test_not_modified_csv_reuses_parsed_frame(tmp_path, monkeypatch, csv_server):
+    monkeypatch.setattr(DataIngestion, "fingerprint_file", str(tmp_path / "fingerprints.json"))
+    # Keep the test run out of the job log in the working tree
+    monkeypatch.setattr(DataIngestion.file_handler, "level", logging.CRITICAL + 1)
+    parses = []
+    parse = DataIngestion._read_csv_fingerprinted
+    monkeypatch.setattr(DataIngestion, "_read_csv_fingerprinted", lambda *a, **k: parses.append(a) or parse(*a, **k))
+    cache = HttpResponseCache(str(tmp_path / "cache"))
+
+    first = load_csv(csv_server, "CSV_Source", cache=cache)
+    assert not first.attrs["unchanged"]
+    commit_fingerprint(first)
+
+    second = load_csv(csv_server, "CSV_Source", cache=cache)
+    assert len(parses) == 1
+    assert cache.hits == 1
+    assert second.attrs["unchanged"]
+    assert second.attrs["fingerprint"] == first.attrs["fingerprint"]
+    pd.testing.assert_frame_equal(second, first)
@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+
+from dataschema.ChurnSchema import CHURN_SCHEMA, apply_churn_schema
+from datastorage.DataStorage import compact_partition, part_file_name, read_columnar
+
+
+def _churn_rows(start, n, geography):
+    return apply_churn_schema(pd.DataFrame({
+        "RowNumber": range(start, start + n),
+        "CustomerId": range(15_000_000 + start, 15_000_000 + start + n),
+        "Surname": [f"S{i}" for i in range(start, start + n)],
+        "CreditScore": 600,
+        "Geography": geography,
+        "Gender": "Female",
+        "Age": 40,
+        "Tenure": 3,
+        "Balance": 1000.0,
+        "NumOfProducts": 1,
+        "HasCrCard": 1,
+        "IsActiveMember": 0,
+        "EstimatedSalary": 50_000.0,
+        "Exited": 0,
+    }), log=False)
+
+
+def test_compaction_keeps_compact_schema(tmp_path):
+    folder = str(tmp_path)
+    _churn_rows(0, 5, "France").to_csv(os.path.join(folder, part_file_name("csv", "csv")), index=False)
+    for i, geography in enumerate(["Spain", "Germany", "France"]):
+        path = os.path.join(folder, part_file_name("csv", "parquet"))
+        _churn_rows(10 * (i + 1), 5, geography).to_parquet(path, index=False)
+
+    outputs = compact_partition(folder, "csv")
+
+    assert len(outputs) == 1
+    df = read_columnar(outputs[0])
+    assert len(df) == 20
+    assert {col: str(dtype) for col, dtype in df.dtypes.items()} == CHURN_SCHEMA
+    assert set(df["Geography"].cat.categories) == {"France", "Spain", "Germany"}
@@ -0,0 +1,38 @@
+import glob
+import os
+
+import pytest
+
+from datavalidation.DataValidation import (ViolationIndex, _synthetic_churn, build_profile, check_drift, load_profile,
+                                           save_profile, validate_churn_data)
+from reporting.ReportQueue import wait_for_reports
+
+
+@pytest.mark.parametrize("report_mode", ["skip", "background"])
+@pytest.mark.parametrize("workers", [None, 2])
+def test_save_index_creates_output_dir(tmp_path, report_mode, workers):
+    df = _synthetic_churn(2_000, seed=1)
+    output_dir = str(tmp_path / "fresh" / "reports")
+    _, _, index = validate_churn_data(df, output_dir=output_dir, workers=workers, return_index=True,
+                                      save_index=True, report_mode=report_mode)
+    wait_for_reports()
+    saved = glob.glob(os.path.join(output_dir, "churn_data_violations_*.npz"))
+    assert len(saved) == 1
+    loaded = ViolationIndex.load(saved[0])
+    assert loaded.rules == index.rules
+    assert (loaded.combine() == index.combine()).all()
+
+
+def test_profile_sketches_round_trip_and_drive_drift(tmp_path):
+    baseline = build_profile(_synthetic_churn(50_000, seed=1))
+    path = save_profile(baseline, str(tmp_path / "baseline.npz"))
+    assert "sketch_items" in load_profile(path)["numeric"]["EstimatedSalary"]
+
+    same = check_drift(build_profile(_synthetic_churn(50_000, seed=3)), path)
+    assert not same["drift"].any()
+
+    shifted = _synthetic_churn(50_000, seed=3)
+    shifted["EstimatedSalary"] = shifted["EstimatedSalary"] * 1.05
+    drift = check_drift(build_profile(shifted), path).set_index("column")
+    assert drift.loc["EstimatedSalary", "drift"]
+    assert drift.loc["EstimatedSalary", "ks"] > 0.01